@@ -0,0 +1,82 @@
+"""Compare Brick Breaker's cached brick layer against redrawing every brick.
+
+For each brick field this reports the one-off cost of rendering the layer,
+the per-frame cost of drawing the bricks with the layer (one brick breaks
+every frame, so each frame also erases one), and the per-frame cost of the
+old approach: clear the screen and draw every brick with two draw calls.
+
+Run from the repository root:
+    python benchmarks/bench_bricks.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from games.brick_breaker.main import Game, Brick, BrickGrid
+
+# (rows, cols, brick width, brick height, margin) on the 800x600 screen
+FIELDS = [
+    (8, 10, 75, 30, 5),    # The densest standard level
+    (20, 40, 18, 10, 2),
+    (50, 100, 7, 5, 1)
+]
+
+
+def fill_level(game, rows, cols, width, height, margin):
+    """Replace the game's level with a full brick field"""
+    game.create_level(1)
+    game.bricks = BrickGrid(rows, cols, width, height, margin, 50)
+    for row in range(rows):
+        for col in range(cols):
+            x, y = game.bricks.position(row, col)
+            game.bricks.place(row, col, Brick(x, y, width, height, (255, 165, 0), 1))
+
+
+def legacy_draw(game):
+    """The original render's brick pass: clear, then every brick"""
+    game.screen.fill(game.bg_color)
+    for brick in game.bricks:
+        brick.draw(game.screen)
+
+
+def measure(game, frames=200):
+    """ms to build the layer, then ms per frame with the layer and the old way"""
+    start = time.perf_counter()
+    game.draw_bricks()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    bricks = list(game.bricks)
+    start = time.perf_counter()
+    for frame in range(frames):
+        brick = bricks[frame % len(bricks)]
+        game.bricks.remove(brick.row, brick.col)
+        game.draw_bricks()
+    layer_ms = (time.perf_counter() - start) / frames * 1000
+
+    legacy_frames = max(5, frames // 10)
+    start = time.perf_counter()
+    for _ in range(legacy_frames):
+        legacy_draw(game)
+    legacy_ms = (time.perf_counter() - start) / legacy_frames * 1000
+    return build_ms, layer_ms, legacy_ms
+
+
+def main():
+    pygame.init()
+    game = Game()
+    print(f"{'field':>9} {'bricks':>7} {'build ms':>9} {'frame ms':>9} {'old frame ms':>13}")
+    for rows, cols, width, height, margin in FIELDS:
+        fill_level(game, rows, cols, width, height, margin)
+        count = len(game.bricks)
+        build_ms, layer_ms, legacy_ms = measure(game)
+        print(f"{rows:>4}x{cols:<4} {count:>7} {build_ms:>9.3f} {layer_ms:>9.3f} {legacy_ms:>13.3f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Compare spatial-hash collision queries against the old brute-force scans.
+
+Moving enemies (40x20) are hit-tested by bullets (5x15), the way UFO
+Invasion does it. The play field grows with the enemy count so density
+stays the same, as it would for a harder difficulty mode with a bigger
+wave.
+
+Run from the repository root:
+    python benchmarks/bench_collisions.py
+"""
+import os
+import sys
+import math
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.spatial_hash import SpatialHash, boxes_overlap
+
+class Box:
+    def __init__(self, x, y, width, height, dx, dy):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.dx = dx
+        self.dy = dy
+
+    def move(self, field_width, field_height):
+        self.x = (self.x + self.dx) % field_width
+        self.y = (self.y + self.dy) % field_height
+
+
+def make_boxes(rng, count, width, height, field_width, field_height, speed):
+    return [Box(rng.uniform(0, field_width), rng.uniform(0, field_height), width, height,
+                rng.uniform(-speed, speed), rng.uniform(-speed, speed))
+            for _ in range(count)]
+
+
+def brute_force(enemies, bullets, field):
+    """The original per-frame scan: every bullet against every enemy, with fresh Rects"""
+    hits = 0
+    for enemy in enemies:
+        enemy.move(*field)
+    for bullet in bullets:
+        bullet_rect = pygame.Rect(bullet.x, bullet.y, bullet.width, bullet.height)
+        for enemy in enemies:
+            if bullet_rect.colliderect(pygame.Rect(enemy.x, enemy.y, enemy.width, enemy.height)):
+                hits += 1
+                break
+    return hits
+
+
+def hashed(enemies, bullets, field, enemy_hash):
+    """Keep the enemies in a spatial hash and only test the ones near each bullet"""
+    hits = 0
+    for enemy in enemies:
+        enemy.move(*field)
+        enemy_hash.move(enemy, enemy.x, enemy.y, enemy.width, enemy.height)
+    for bullet in bullets:
+        for enemy in enemy_hash.query(bullet.x, bullet.y, bullet.width, bullet.height):
+            if boxes_overlap(bullet.x, bullet.y, bullet.width, bullet.height,
+                             enemy.x, enemy.y, enemy.width, enemy.height):
+                hits += 1
+                break
+    return hits
+
+
+def run(count, frames=30):
+    rng = random.Random(count)
+    scale = math.sqrt(count / 50)  # 50 enemies on an 800x600 screen, as in level 1
+    field = (800 * scale, 600 * scale)
+    enemies = make_boxes(rng, count, 40, 20, *field, speed=3)
+    bullets = make_boxes(rng, max(1, count // 5), 5, 15, *field, speed=0)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        brute_force(enemies, bullets, field)
+    brute_ms = (time.perf_counter() - start) / frames * 1000
+
+    enemy_hash = SpatialHash(cell_size=64)
+    for enemy in enemies:
+        enemy_hash.insert(enemy, enemy.x, enemy.y, enemy.width, enemy.height)
+    start = time.perf_counter()
+    for _ in range(frames):
+        hashed(enemies, bullets, field, enemy_hash)
+    hash_ms = (time.perf_counter() - start) / frames * 1000
+
+    per_query = enemy_hash.candidates / max(1, enemy_hash.queries)
+    return len(bullets), brute_ms, hash_ms, per_query
+
+
+def main():
+    pygame.init()
+
+    print(f"{'enemies':>8} {'bullets':>8} {'brute ms':>9} {'hash ms':>8} "
+          f"{'per entity us':>14} {'candidates/query':>17}")
+    for count in (50, 200, 1000, 5000):
+        bullets, brute_ms, hash_ms, per_query = run(count)
+        per_entity = hash_ms * 1000 / (count + bullets)
+        print(f"{count:>8} {bullets:>8} {brute_ms:>9.3f} {hash_ms:>8.3f} "
+              f"{per_entity:>14.2f} {per_query:>17.2f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare the NumPy particle pool against the old dict-per-particle system.
+
+Run from the repository root:
+    python benchmarks/bench_particles.py
+"""
+import os
+import sys
+import math
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from core.particles import ParticlePool
+
+class LegacyParticles:
+    """The original GUIManager particle code, kept here as a baseline"""
+
+    def __init__(self):
+        self.particles = []
+
+    def emit(self, x, y, count, color):
+        for _ in range(count):
+            angle = random.uniform(0, math.pi * 2)
+            speed = random.uniform(1, 3)
+            size = random.randint(2, 4)
+            life = random.randint(20, 40)
+
+            self.particles.append({
+                'x': x,
+                'y': y,
+                'dx': math.cos(angle) * speed,
+                'dy': math.sin(angle) * speed,
+                'size': size,
+                'color': color,
+                'life': life
+            })
+
+    def update(self):
+        for particle in self.particles[:]:
+            particle['life'] -= 1
+            if particle['life'] <= 0:
+                self.particles.remove(particle)
+            else:
+                particle['x'] += particle['dx']
+                particle['y'] += particle['dy']
+
+    def draw(self, surface):
+        for particle in self.particles:
+            alpha = min(255, int(255 * (particle['life'] / 40)))
+            color = list(particle['color'])
+            pygame.draw.circle(surface, (*color[:3], alpha),
+                              (int(particle['x']), int(particle['y'])),
+                              particle['size'])
+
+    def __len__(self):
+        return len(self.particles)
+
+
+def run(system, screen, burst, frames=120):
+    """Emit a burst every frame and time update + draw"""
+    colors = [(57, 255, 20), (0, 195, 255), (255, 16, 240)]
+    width, height = screen.get_size()
+    update_time = draw_time = 0.0
+    peak = 0
+
+    for frame in range(frames):
+        system.emit(random.randint(0, width), random.randint(0, height), burst, colors[frame % 3])
+
+        start = time.perf_counter()
+        system.update()
+        update_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        system.draw(screen)
+        draw_time += time.perf_counter() - start
+
+        peak = max(peak, len(system))
+
+    return peak, update_time / frames * 1000, draw_time / frames * 1000
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+
+    print(f"{'burst':>6} {'live':>7} {'impl':>7} {'update ms':>10} {'draw ms':>9} {'total ms':>9}")
+    for burst in (10, 50, 200, 500):
+        for name, system in (("legacy", LegacyParticles()),
+                             ("pool", ParticlePool(capacity=burst * 41))):
+            peak, update_ms, draw_ms = run(system, screen, burst)
+            print(f"{burst:>6} {peak:>7} {name:>7} {update_ms:>10.3f} {draw_ms:>9.3f} "
+                  f"{update_ms + draw_ms:>9.3f}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
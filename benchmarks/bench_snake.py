@@ -0,0 +1,112 @@
+"""Measure Snake Reloaded's tick and frame cost against board size and snake length.
+
+The snake follows a Hamiltonian cycle around the board, so it can grow to
+any length without crashing. For each board and length this reports the
+simulation rate and the frame time of the incremental renderer next to the
+old full redraw (every grid line and every segment each frame).
+
+Run from the repository root:
+    python benchmarks/bench_snake.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from games.snake_reloaded.main import Game, Board, Snake
+
+BOARDS = [
+    {"cols": 40, "rows": 30, "cell_size": 20},   # Classic
+    {"cols": 200, "rows": 150, "cell_size": 4},
+    {"cols": 500, "rows": 500, "cell_size": 2}
+]
+LENGTHS = (3, 100, 1000, 10000, 100000)
+
+
+def steer(game):
+    """Direction that keeps the head on a cycle through every cell (rows must be even)"""
+    col = game.snake.body[0][0] // game.cell_size
+    row = game.snake.body[0][1] // game.cell_size
+    if col == 0:
+        return "UP" if row > 0 else "RIGHT"
+    if row % 2 == 0:
+        return "RIGHT" if col < game.cols - 1 else "DOWN"
+    if col > 1:
+        return "LEFT"
+    return "DOWN" if row < game.rows - 1 else "LEFT"
+
+
+def tick(game):
+    game.snake.change_to = steer(game)
+    game.update()
+
+
+def legacy_render(game):
+    """The original render: clear, every grid line, food, every segment, score"""
+    game.screen.fill(game.bg_color)
+    for x in range(0, game.width, game.cell_size):
+        pygame.draw.line(game.screen, game.grid_color, (x, 0), (x, game.height))
+    for y in range(0, game.height, game.cell_size):
+        pygame.draw.line(game.screen, game.grid_color, (0, y), (game.width, y))
+    game.food.draw(game.screen)
+    game.snake.draw(game.screen)
+    score_text = game.font_medium.render(f"Score: {game.score}", True, (0, 255, 0))
+    game.screen.blit(score_text, (10, 10))
+    pygame.display.flip()
+
+
+def grow_to(game, length):
+    """Start a snake in the top-left corner and run it until it is length segments long"""
+    game.reset(seed=0)
+    game.board = Board(game.width, game.height, game.cell_size)
+    game.snake = Snake(2 * game.cell_size, 0, game.cell_size, game.board)
+    game.snake.length = length
+    while len(game.snake.body) < length:
+        tick(game)
+    game.redraw_field()
+
+
+def measure(game, frames=200):
+    """Microseconds per simulation tick, then ms per frame (one tick each) new vs old"""
+    start = time.perf_counter()
+    for _ in range(frames * 5):
+        tick(game)
+    tick_us = (time.perf_counter() - start) / (frames * 5) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        tick(game)
+        game.render()
+    render_ms = (time.perf_counter() - start) / frames * 1000 - tick_us / 1000
+
+    legacy_frames = max(5, frames // 10)
+    start = time.perf_counter()
+    for _ in range(legacy_frames):
+        tick(game)
+        legacy_render(game)
+    legacy_ms = (time.perf_counter() - start) / legacy_frames * 1000 - tick_us / 1000
+    game.redraw_field()  # legacy_render bypassed the incremental renderer
+    return tick_us, render_ms, legacy_ms
+
+
+def main():
+    pygame.init()
+    print(f"{'board':>9} {'length':>7} {'ticks/s':>9} {'frame ms':>9} {'old frame ms':>13}")
+    for board in BOARDS:
+        game = Game(**board)
+        for length in LENGTHS:
+            if length > board["cols"] * board["rows"] // 2:
+                continue
+            grow_to(game, length)
+            tick_us, render_ms, legacy_ms = measure(game)
+            print(f"{board['cols']:>4}x{board['rows']:<4} {length:>7} {1e6 / tick_us:>9,.0f} "
+                  f"{render_ms:>9.3f} {legacy_ms:>13.3f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import threading
+
+import pygame
+
+class AssetCache:
+    """Thread-safe cache of loaded fonts and decoded sounds
+
+    Games load their assets through the shared `assets` instance, so the
+    hub can load them ahead of time on a background thread (see
+    core/prewarm.py) and launching a game just picks them up.
+    """
+
+    def __init__(self):
+        self.fonts = {}
+        self.sounds = {}
+        self.lock = threading.RLock()  # SDL_ttf and the mixer aren't safe to call concurrently
+
+        # Counters for the debug overlay
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, path, size, fallback="Arial", bold=False):
+        """A font from a file, or the fallback system font if the file is missing"""
+        key = (path, size, fallback, bold)
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is not None:
+                self.hits += 1
+                return font
+
+            self.misses += 1
+            try:
+                font = pygame.font.Font(path, size)
+            except (FileNotFoundError, OSError):
+                font = pygame.font.SysFont(fallback, size, bold=bold)
+            self.fonts[key] = font
+            return font
+
+    def sound(self, path):
+        """A decoded sound, or None if it is missing or can't be played"""
+        with self.lock:
+            if path in self.sounds:
+                self.hits += 1
+                return self.sounds[path]
+
+            # Missing files are cached too, so games don't probe the disk every launch
+            self.misses += 1
+            sound = None
+            if os.path.exists(path):
+                try:
+                    sound = pygame.mixer.Sound(path)
+                except pygame.error as e:
+                    print(f"Could not load sound {path}: {e}")
+            self.sounds[path] = sound
+            return sound
+
+    def clear(self):
+        with self.lock:
+            self.fonts.clear()
+            self.sounds.clear()
+
+
+# Shared by the hub and every game
+assets = AssetCache()
@@ -0,0 +1,625 @@
+import numpy as np
+
+# Outward normals of a box's left, right, top and bottom sides
+SIDE_NX = np.array([-1, 1, 0, 0])
+SIDE_NY = np.array([0, 0, -1, 1])
+
+
+def sweep_circles_boxes(x, y, dx, dy, radius, left, top, right, bottom):
+    """Vectorized sweep_circle_box (see games/brick_breaker/main.py)
+
+    Arguments broadcast against each other. Returns arrays (t, nx, ny)
+    where t is inf for the circles that don't touch their box.
+    """
+    x, y, dx, dy, left, top, right, bottom = np.broadcast_arrays(x, y, dx, dy, left, top, right, bottom)
+    t = np.full(x.shape, np.inf)
+    nx = np.zeros(x.shape)
+    ny = np.zeros(x.shape)
+    moving = (dx != 0) | (dy != 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Already overlapping: the normal points out from the nearest surface
+        offset_x = x - np.minimum(np.maximum(x, left), right)
+        offset_y = y - np.minimum(np.maximum(y, top), bottom)
+        distance_sq = offset_x * offset_x + offset_y * offset_y
+        overlap = distance_sq < radius * radius
+        distance = np.sqrt(distance_sq)
+        out_x = offset_x / distance
+        out_y = offset_y / distance
+        inside = distance_sq == 0
+        side = np.stack([x - left, right - x, y - top, bottom - y]).argmin(axis=0)
+        out_x = np.where(inside, SIDE_NX[side], out_x)
+        out_y = np.where(inside, SIDE_NY[side], out_y)
+        pushing_in = overlap & moving & (dx * out_x + dy * out_y < 0)
+        t[pushing_in] = 0.0
+        nx[pushing_in] = out_x[pushing_in]
+        ny[pushing_in] = out_y[pushing_in]
+
+        # Slab test against the grown box
+        slabs = []
+        for start, delta, low, high in ((x, dx, left - radius, right + radius),
+                                        (y, dy, top - radius, bottom + radius)):
+            still = delta == 0
+            t0 = np.where(still, -np.inf, (np.where(delta > 0, low, high) - start) / delta)
+            t1 = np.where(still, np.inf, (np.where(delta > 0, high, low) - start) / delta)
+            slabs.append((t0, t1, still & ((start < low) | (start > high))))
+        (tx0, tx1, miss_x), (ty0, ty1, miss_y) = slabs
+        hit_x = tx0 >= ty0  # Ties go to the sides, as in the scalar version
+        t_enter = np.maximum(tx0, ty0)
+        t_exit = np.minimum(tx1, ty1)
+        slab = (moving & ~overlap & ~miss_x & ~miss_y &
+                (t_enter <= t_exit) & (t_enter <= 1) & (t_exit > 0))
+        t_enter = np.maximum(t_enter, 0.0)
+
+        # Entering next to a corner, the contact is with the corner's rounding (if any)
+        px = x + dx * t_enter
+        py = y + dy * t_enter
+        in_corner = ((px < left) | (px > right)) & ((py < top) | (py > bottom))
+        corner_x = x - np.where(px < left, left, right)
+        corner_y = y - np.where(py < top, top, bottom)
+        a = dx * dx + dy * dy
+        b = 2 * (dx * corner_x + dy * corner_y)
+        c = corner_x * corner_x + corner_y * corner_y - radius * radius
+        discriminant = b * b - 4 * a * c
+        t_corner = (-b - np.sqrt(discriminant)) / (2 * a)
+        corner = slab & in_corner & (b < 0) & (discriminant >= 0) & (t_corner <= 1)
+        t_corner = np.maximum(t_corner, 0.0)
+        t = np.where(corner, t_corner, t)
+        nx = np.where(corner, (corner_x + dx * t_corner) / radius, nx)
+        ny = np.where(corner, (corner_y + dy * t_corner) / radius, ny)
+
+    face = slab & ~in_corner
+    t = np.where(face, t_enter, t)
+    nx = np.where(face & hit_x, np.where(dx > 0, -1, 1), np.where(face, 0, nx))
+    ny = np.where(face & ~hit_x, np.where(dy > 0, -1, 1), np.where(face, 0, ny))
+    return t, nx, ny
+
+
+class BatchEnv:
+    """Steps many independent game instances in lock-step with NumPy arrays
+
+    Finished instances stay frozen (and report done) until they are reset
+    with reset(mask). Observations are dicts of arrays with one row per
+    instance. The arrays are the simulator's own buffers, so copy them
+    if you keep them across steps.
+    """
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.done = np.zeros(num_envs, dtype=bool)
+
+    def _mask(self, mask):
+        """Normalize a reset mask to a boolean array over all instances"""
+        if mask is None:
+            return np.ones(self.num_envs, dtype=bool)
+        return np.asarray(mask, dtype=bool)
+
+    def step(self, actions):
+        """Advance every running instance one tick, returns (obs, rewards, dones)"""
+        actions = np.asarray(actions)
+        previous_score = self.score.copy()
+        running = ~self.done
+        if running.any():
+            self._step(actions, running)
+        return self.observe(), self.score - previous_score, self.done.copy()
+
+
+class BatchSnake(BatchEnv):
+    """Vectorized Snake Reloaded (see games/snake_reloaded/main.py)
+
+    Actions: 0 = keep going, 1 = up, 2 = down, 3 = left, 4 = right.
+    Each grid cell stores the tick at which the body segment on it
+    expires. A cell is occupied while its expiry is greater than the
+    instance's tick counter, which gives O(1) self-collision checks and
+    tail removal without storing the body as a list.
+    """
+
+    # Direction deltas (dx, dy) indexed by direction code - 1
+    DELTAS = np.array([[0, -1], [0, 1], [-1, 0], [1, 0]])
+    OPPOSITE = np.array([0, 2, 1, 4, 3])
+
+    def __init__(self, num_envs, width=800, height=600, cell_size=20, seed=None):
+        super().__init__(num_envs, seed)
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+
+        self.tick = np.zeros(num_envs, dtype=np.int64)
+        self.expiry = np.zeros((num_envs, self.rows, self.cols), dtype=np.int64)
+        self.head = np.zeros((num_envs, 2), dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64)
+        self.change_to = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.zeros((num_envs, 2), dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset the selected instances (all by default), returns observations"""
+        mask = self._mask(mask)
+        index = np.flatnonzero(mask)
+        if not len(index):
+            return self.observe()
+
+        self.tick[index] = 0
+        self.score[index] = 0
+        self.done[index] = False
+        self.expiry[index] = 0
+
+        # Three segments in the middle of the board, heading right
+        start_x, start_y = self.cols // 2, self.rows // 2
+        self.head[index] = (start_x, start_y)
+        self.direction[index] = 4
+        self.change_to[index] = 4
+        self.length[index] = 3
+        for segment in range(3):
+            self.expiry[index, start_y, start_x - segment] = 3 - segment
+
+        # Like the original, the first food ignores the snake's body
+        self.food[index, 0] = self.rng.integers(0, self.cols, len(index))
+        self.food[index, 1] = self.rng.integers(0, self.rows, len(index))
+        return self.observe()
+
+    def _step(self, actions, running):
+        index = np.flatnonzero(running)
+        action = np.broadcast_to(actions, (self.num_envs,))[index]
+
+        # Steering requests persist, 180-degree turns are ignored
+        self.change_to[index] = np.where(action > 0, action, self.change_to[index])
+        turn = self.change_to[index] != self.OPPOSITE[self.direction[index]]
+        self.direction[index] = np.where(turn, self.change_to[index], self.direction[index])
+
+        self.tick[index] += 1
+        head = self.head[index] + self.DELTAS[self.direction[index] - 1]
+        self.head[index] = head
+
+        # Hitting a wall ends the game before the head is written
+        inside = ((head[:, 0] >= 0) & (head[:, 0] < self.cols) &
+                  (head[:, 1] >= 0) & (head[:, 1] < self.rows))
+        self.done[index[~inside]] = True
+        index, head = index[inside], head[inside]
+
+        # Segments whose expiry has passed are the popped tail
+        tick = self.tick[index]
+        hit_self = self.expiry[index, head[:, 1], head[:, 0]] > tick
+        self.done[index[hit_self]] = True
+        index, head, tick = index[~hit_self], head[~hit_self], tick[~hit_self]
+
+        self.expiry[index, head[:, 1], head[:, 0]] = tick + self.length[index]
+
+        # Eating: score, grow by delaying every segment's expiry, respawn food
+        ate = np.all(head == self.food[index], axis=1)
+        eaten = index[ate]
+        if len(eaten):
+            self.score[eaten] += 10
+            self.length[eaten] += 1
+            occupied = self.expiry[eaten] > self.tick[eaten, None, None]
+            self.expiry[eaten] += occupied
+            self._respawn_food(eaten, occupied)
+
+    def _respawn_food(self, index, occupied):
+        """Pick a uniformly random free cell for each instance"""
+        weights = self.rng.random((len(index), self.rows * self.cols))
+        weights[occupied.reshape(len(index), -1)] = -1
+        cell = weights.argmax(axis=1)
+
+        # A full board has nowhere left to put food
+        full = weights[np.arange(len(index)), cell] < 0
+        self.done[index[full]] = True
+
+        self.food[index, 0] = cell % self.cols
+        self.food[index, 1] = cell // self.cols
+
+    def occupancy(self):
+        """Boolean (num_envs, rows, cols) grid of cells covered by the snake"""
+        return self.expiry > self.tick[:, None, None]
+
+    def observe(self):
+        return {
+            "head": self.head,
+            "direction": self.direction,
+            "length": self.length,
+            "food": self.food,
+            "score": self.score,
+            "done": self.done
+        }
+
+
+class BatchCoinDash(BatchEnv):
+    """Vectorized Coin Dash (see games/coin_dash/main.py)
+
+    Actions are bitmasks: 1 = left, 2 = right, 4 = up, 8 = down.
+    """
+
+    LEFT, RIGHT, UP, DOWN = 1, 2, 4, 8
+
+    def __init__(self, num_envs, width=800, height=600, num_coins=5, max_obstacles=64, seed=None):
+        super().__init__(num_envs, seed)
+        self.width = width
+        self.height = height
+        self.num_coins = num_coins
+        self.max_obstacles = max_obstacles
+
+        self.player_size = 30
+        self.player_speed = 5
+        self.coin_radius = 10
+
+        self.player = np.zeros((num_envs, 2), dtype=np.int64)
+        self.coins = np.zeros((num_envs, num_coins, 2), dtype=np.int64)
+
+        # Obstacles live in fixed slots, inactive slots are ignored
+        self.obstacle_pos = np.zeros((num_envs, max_obstacles, 2), dtype=np.int64)
+        self.obstacle_size = np.zeros((num_envs, max_obstacles, 2), dtype=np.int64)
+        self.obstacle_vel = np.zeros((num_envs, max_obstacles, 2), dtype=np.int64)
+        self.obstacle_active = np.zeros((num_envs, max_obstacles), dtype=bool)
+
+        self.time_left = np.zeros(num_envs, dtype=np.int64)
+        self.timer = np.zeros(num_envs, dtype=np.int64)
+        self.obstacle_timer = np.zeros(num_envs, dtype=np.int64)
+        self.obstacle_spawn_time = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset the selected instances (all by default), returns observations"""
+        index = np.flatnonzero(self._mask(mask))
+        if not len(index):
+            return self.observe()
+
+        self.score[index] = 0
+        self.done[index] = False
+        self.time_left[index] = 30
+        self.timer[index] = 0
+        self.obstacle_timer[index] = 0
+        self.obstacle_spawn_time[index] = 60
+
+        self.player[index] = (self.width // 2 - self.player_size // 2,
+                              self.height // 2 - self.player_size // 2)
+        self.obstacle_active[index] = False
+        self.coins[index] = self._random_coins((len(index), self.num_coins))
+        return self.observe()
+
+    def _random_coins(self, shape):
+        """Random coin centres, kept a margin away from the edges"""
+        margin = self.coin_radius * 2
+        xs = self.rng.integers(margin, self.width - margin + 1, shape)
+        ys = self.rng.integers(margin, self.height - margin + 1, shape)
+        return np.stack([xs, ys], axis=-1)
+
+    def _step(self, actions, running):
+        index = np.flatnonzero(running)
+        action = np.broadcast_to(actions, (self.num_envs,))[index]
+
+        # Move the player with bounds checking
+        speed = self.player_speed
+        dx = (((action & self.RIGHT) > 0).astype(np.int64) - ((action & self.LEFT) > 0)) * speed
+        dy = (((action & self.DOWN) > 0).astype(np.int64) - ((action & self.UP) > 0)) * speed
+        size = self.player_size
+        px = np.clip(self.player[index, 0] + dx, 0, self.width - size)
+        py = np.clip(self.player[index, 1] + dy, 0, self.height - size)
+        self.player[index, 0] = px
+        self.player[index, 1] = py
+
+        # Coins: rect overlap test against every coin at once
+        radius = self.coin_radius
+        coins = self.coins[index]
+        hit = ((px[:, None] < coins[..., 0] + radius) & (coins[..., 0] - radius < px[:, None] + size) &
+               (py[:, None] < coins[..., 1] + radius) & (coins[..., 1] - radius < py[:, None] + size))
+        collected = hit.sum(axis=1)
+        self.score[index] += collected
+        self.time_left[index] += collected
+        if hit.any():
+            env, slot = np.nonzero(hit)
+            self.coins[index[env], slot] = self._random_coins(len(env))
+
+        # Move obstacles, drop the ones that left the screen, then test the rest
+        pos = self.obstacle_pos[index] + self.obstacle_vel[index]
+        obstacle_size = self.obstacle_size[index]
+        active = self.obstacle_active[index]
+        off_screen = ((pos[..., 0] + obstacle_size[..., 0] < 0) | (pos[..., 0] > self.width) |
+                      (pos[..., 1] + obstacle_size[..., 1] < 0) | (pos[..., 1] > self.height))
+        active &= ~off_screen
+        crash = active & ((px[:, None] < pos[..., 0] + obstacle_size[..., 0]) &
+                          (pos[..., 0] < px[:, None] + size) &
+                          (py[:, None] < pos[..., 1] + obstacle_size[..., 1]) &
+                          (pos[..., 1] < py[:, None] + size))
+        self.obstacle_pos[index] = pos
+        self.obstacle_active[index] = active
+        self.done[index[crash.any(axis=1)]] = True
+
+        # Spawn new obstacles, faster as the game goes on
+        self.obstacle_timer[index] += 1
+        spawn = index[self.obstacle_timer[index] >= self.obstacle_spawn_time[index]]
+        if len(spawn):
+            self._spawn_obstacles(spawn)
+            self.obstacle_timer[spawn] = 0
+            self.obstacle_spawn_time[spawn] = np.maximum(30, self.obstacle_spawn_time[spawn] - 1)
+
+        # Countdown, 60 ticks per second
+        self.timer[index] += 1
+        second = index[self.timer[index] >= 60]
+        self.time_left[second] -= 1
+        self.timer[second] = 0
+        self.done[second[self.time_left[second] <= 0]] = True
+
+    def _spawn_obstacles(self, index):
+        """Place one obstacle on a random edge for each instance"""
+        count = len(index)
+        rng = self.rng
+        width = rng.integers(20, 41, count)
+        height = rng.integers(20, 41, count)
+        edge = rng.integers(0, 4, count)  # top, right, bottom, left
+
+        drift = rng.integers(-1, 2, count)
+        speed = rng.integers(1, 4, count)
+        along_x = rng.integers(0, self.width - width + 1)
+        along_y = rng.integers(0, self.height - height + 1)
+
+        x = np.select([edge == 0, edge == 1, edge == 2], [along_x, self.width, along_x], -width)
+        y = np.select([edge == 0, edge == 1, edge == 2], [-height, along_y, self.height], along_y)
+        dx = np.select([edge == 1, edge == 3], [-speed, speed], drift)
+        dy = np.select([edge == 0, edge == 2], [speed, -speed], drift)
+
+        # Use the first free slot, instances that are full skip this spawn
+        free = ~self.obstacle_active[index]
+        has_free = free.any(axis=1)
+        slot = free.argmax(axis=1)
+        index, slot = index[has_free], slot[has_free]
+
+        self.obstacle_pos[index, slot] = np.stack([x, y], axis=-1)[has_free]
+        self.obstacle_size[index, slot] = np.stack([width, height], axis=-1)[has_free]
+        self.obstacle_vel[index, slot] = np.stack([dx, dy], axis=-1)[has_free]
+        self.obstacle_active[index, slot] = True
+
+    def observe(self):
+        return {
+            "player": self.player,
+            "coins": self.coins,
+            "obstacle_pos": self.obstacle_pos,
+            "obstacle_size": self.obstacle_size,
+            "obstacle_active": self.obstacle_active,
+            "time_left": self.time_left,
+            "score": self.score,
+            "done": self.done
+        }
+
+
+class BatchBrickBreaker(BatchEnv):
+    """Vectorized Brick Breaker (see games/brick_breaker/main.py)
+
+    Actions are bitmasks: 1 = left, 2 = right, 4 = launch. Balls are swept
+    like Ball.move, so given the same ball launch directions an instance
+    plays out exactly like the game (only the random draws differ).
+    """
+
+    LEFT, RIGHT, LAUNCH = 1, 2, 4
+
+    def __init__(self, num_envs, width=800, height=600, seed=None):
+        super().__init__(num_envs, seed)
+        self.width = width
+        self.height = height
+
+        self.paddle_width = 100
+        self.paddle_height = 20
+        self.paddle_speed = 8
+        self.paddle_y = height - 50
+        self.ball_radius = 10
+        self.max_impacts = 8  # Bounces resolved per tick, as in Ball.move
+
+        # Same layout as Game.create_level, with room for the maximum 8 rows
+        self.max_rows, self.cols = 8, 10
+        self.brick_width, self.brick_height, self.brick_margin, self.top_margin = 75, 30, 5, 50
+        self.pitch_x = self.brick_width + self.brick_margin
+        self.pitch_y = self.brick_height + self.brick_margin
+        col = np.arange(self.cols)
+        row = np.arange(self.max_rows)
+        self.brick_left = np.tile(col * self.pitch_x + self.brick_margin, self.max_rows)
+        self.brick_top = np.repeat(row * self.pitch_y + self.top_margin, self.cols)
+        self.brick_right = self.brick_left + self.brick_width
+        self.brick_bottom = self.brick_top + self.brick_height
+        self.brick_points = np.repeat(row + 1, self.cols)
+
+        self.paddle_x = np.zeros(num_envs, dtype=np.int64)
+        self.ball = np.zeros((num_envs, 2), dtype=np.float64)
+        self.velocity = np.zeros((num_envs, 2), dtype=np.float64)
+        self.moving = np.zeros(num_envs, dtype=bool)
+        self.bricks = np.zeros((num_envs, self.max_rows * self.cols), dtype=bool)
+        self.lives = np.zeros(num_envs, dtype=np.int64)
+        self.level = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reset the selected instances (all by default), returns observations"""
+        index = np.flatnonzero(self._mask(mask))
+        if not len(index):
+            return self.observe()
+
+        self.score[index] = 0
+        self.done[index] = False
+        self.lives[index] = 3
+        self.level[index] = 1
+        self._create_level(index)
+        self.paddle_x[index] = self.width // 2 - self.paddle_width // 2
+        self._reset_ball(index)
+        return self.observe()
+
+    def _create_level(self, index):
+        rows = np.minimum(3 + self.level[index], self.max_rows)
+        self.bricks[index] = np.arange(self.max_rows * self.cols)[None, :] < (rows * self.cols)[:, None]
+
+    def _reset_ball(self, index):
+        """Park the ball on the paddle with a random horizontal direction"""
+        self.ball[index, 0] = self.paddle_x[index] + self.paddle_width // 2
+        self.ball[index, 1] = self.paddle_y - self.ball_radius
+        self.moving[index] = False
+        self.velocity[index, 0] = self.rng.choice([-5, 5], len(index))
+        self.velocity[index, 1] = -5
+
+    def _step(self, actions, running):
+        index = np.flatnonzero(running)
+        action = np.broadcast_to(actions, (self.num_envs,))[index]
+
+        # Launch, then move the paddle
+        self.moving[index[(action & self.LAUNCH) > 0]] = True
+        paddle_x = self.paddle_x[index]
+        paddle_x = np.where(action & self.LEFT, np.maximum(0, paddle_x - self.paddle_speed), paddle_x)
+        paddle_x = np.where(action & self.RIGHT,
+                            np.minimum(self.width - self.paddle_width, paddle_x + self.paddle_speed), paddle_x)
+        self.paddle_x[index] = paddle_x
+
+        # Balls that are not moving ride on the paddle
+        parked = index[~self.moving[index]]
+        if len(parked):
+            self._reset_ball(parked)
+        index = index[self.moving[index]]
+        if not len(index):
+            return
+
+        # Sweep the balls, bouncing off the walls, paddle and bricks on the way
+        self._move_balls(index)
+
+        # Cleared levels move on to the next one
+        cleared = index[~self.bricks[index].any(axis=1)]
+        if len(cleared):
+            self.level[cleared] += 1
+            self._create_level(cleared)
+            self._reset_ball(cleared)
+
+        # Losing the ball costs a life
+        lost = index[self.ball[index, 1] > self.height + self.ball_radius]
+        if len(lost):
+            self.lives[lost] -= 1
+            self.done[lost[self.lives[lost] <= 0]] = True
+            self._reset_ball(lost[self.lives[lost] > 0])
+
+    def _move_balls(self, index):
+        """Move the given balls through one tick, as Ball.move does
+
+        Each pass finds every ball's earliest contact with a wall, its
+        paddle or a live brick, moves the ball there and bounces it. Balls
+        with motion left go round again, up to max_impacts passes.
+        """
+        radius = self.ball_radius
+        ball = self.ball[index]
+        velocity = self.velocity[index]
+        bricks = self.bricks[index]
+        paddle_left = self.paddle_x[index]
+        half_width = self.paddle_width / 2
+        remaining = np.ones(len(index))  # Fraction of this tick's motion still to travel
+        live = np.arange(len(index))
+
+        for _ in range(self.max_impacts):
+            if not len(live):
+                break
+            x, y = ball[live, 0], ball[live, 1]
+            dx = velocity[live, 0] * remaining[live]
+            dy = velocity[live, 1] * remaining[live]
+
+            # Only the bricks in the grid cells under each swept path can be hit
+            candidates, usable = self._brick_candidates(x, y, dx, dy)
+            usable &= bricks[live[:, None], candidates]
+
+            # Contact times in tie-break order: side walls, top wall, paddle, bricks in layout order
+            times = np.full((len(live), 3 + candidates.shape[1]), np.inf)
+            normal_x = np.zeros(times.shape)
+            normal_y = np.zeros(times.shape)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                left_wall = (dx < 0) & (x + dx <= radius)
+                right_wall = (dx > 0) & (x + dx >= self.width - radius)
+                times[left_wall, 0] = np.maximum(0.0, (radius - x[left_wall]) / dx[left_wall])
+                times[right_wall, 0] = np.maximum(0.0, (self.width - radius - x[right_wall]) / dx[right_wall])
+                normal_x[:, 0] = np.where(left_wall, 1, -1)
+                top_wall = (dy < 0) & (y + dy <= radius)
+                times[top_wall, 1] = np.maximum(0.0, (radius - y[top_wall]) / dy[top_wall])
+                normal_y[:, 1] = 1
+
+            paddle = paddle_left[live]
+            times[:, 2], normal_x[:, 2], normal_y[:, 2] = sweep_circles_boxes(
+                x, y, dx, dy, radius, paddle, self.paddle_y,
+                paddle + self.paddle_width, self.paddle_y + self.paddle_height)
+
+            brick_times, normal_x[:, 3:], normal_y[:, 3:] = sweep_circles_boxes(
+                x[:, None], y[:, None], dx[:, None], dy[:, None], radius,
+                self.brick_left[candidates], self.brick_top[candidates],
+                self.brick_right[candidates], self.brick_bottom[candidates])
+            times[:, 3:] = np.where(usable, brick_times, np.inf)
+
+            first = times.argmin(axis=1)
+            rows = np.arange(len(live))
+            t = times[rows, first]
+            hit = np.isfinite(t)
+
+            # Balls with nothing in the way finish their move
+            free = live[~hit]
+            ball[free, 0] += dx[~hit]
+            ball[free, 1] += dy[~hit]
+
+            # The rest travel up to the contact point, then bounce
+            candidates = candidates[hit]
+            live, first, t = live[hit], first[hit], t[hit]
+            ball[live, 0] += dx[hit] * t
+            ball[live, 1] += dy[hit] * t
+            remaining[live] *= 1 - t
+            nx = normal_x[rows[hit], first]
+            ny = normal_y[rows[hit], first]
+
+            on_paddle = first == 2
+            bounced = live[on_paddle]
+            relative_x = (ball[bounced, 0] - (paddle_left[bounced] + half_width)) / half_width
+            velocity[bounced, 0] = relative_x * 7
+            velocity[bounced, 1] = -np.abs(velocity[bounced, 1])
+
+            reflected = live[~on_paddle]
+            nx, ny = nx[~on_paddle], ny[~on_paddle]
+            along = velocity[reflected, 0] * nx + velocity[reflected, 1] * ny
+            into = along < 0
+            velocity[reflected[into], 0] -= 2 * along[into] * nx[into]
+            velocity[reflected[into], 1] -= 2 * along[into] * ny[into]
+
+            broken = first >= 3
+            brick = candidates[broken, first[broken] - 3]
+            bricks[live[broken], brick] = False
+            self.score[index[live[broken]]] += self.brick_points[brick]
+
+            live = live[remaining[live] > 0]
+
+        self.ball[index] = ball
+        self.velocity[index] = velocity
+        self.bricks[index] = bricks
+
+    def _brick_candidates(self, x, y, dx, dy):
+        """Brick indices in the cells each move's swept box touches, as (indices, valid)
+
+        Rows are padded to the widest range; padding is marked invalid.
+        Indices come in layout order, like BrickGrid.query.
+        """
+        radius = self.ball_radius
+        box_x = np.minimum(x, x + dx) - radius
+        box_y = np.minimum(y, y + dy) - radius
+        box_right = box_x + (np.abs(dx) + radius * 2)
+        box_bottom = box_y + (np.abs(dy) + radius * 2)
+        col0 = np.maximum(0, -np.floor((self.brick_margin + self.brick_width - box_x) / self.pitch_x))
+        col1 = np.minimum(self.cols - 1, np.floor((box_right - self.brick_margin) / self.pitch_x))
+        row0 = np.maximum(0, -np.floor((self.top_margin + self.brick_height - box_y) / self.pitch_y))
+        row1 = np.minimum(self.max_rows - 1, np.floor((box_bottom - self.top_margin) / self.pitch_y))
+        col0, col1, row0, row1 = (a.astype(np.int64) for a in (col0, col1, row0, row1))
+
+        span_rows = int(max(0, (row1 - row0).max(initial=-1) + 1))
+        span_cols = int(max(0, (col1 - col0).max(initial=-1) + 1))
+        rows = row0[:, None, None] + np.arange(span_rows)[None, :, None]
+        cols = col0[:, None, None] + np.arange(span_cols)[None, None, :]
+        valid = (rows <= row1[:, None, None]) & (cols <= col1[:, None, None])
+        indices = np.where(valid, rows * self.cols + cols, 0).reshape(len(x), -1)
+        return indices, valid.reshape(len(x), -1)
+
+    def observe(self):
+        return {
+            "paddle_x": self.paddle_x,
+            "ball": self.ball,
+            "velocity": self.velocity,
+            "moving": self.moving,
+            "bricks": self.bricks,
+            "lives": self.lives,
+            "level": self.level,
+            "score": self.score,
+            "done": self.done
+        }
@@ -0,0 +1,46 @@
+import time
+import pygame
+
+class FrameScheduler:
+    """Adapts the hub frame rate to whether anything is happening on screen"""
+
+    def __init__(self, clock, active_fps=60, idle_fps=10, idle_after=2.0):
+        self.clock = clock
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after  # Seconds without activity before idling
+
+        self.mode = "active"
+        self.mode_time = {"active": 0.0, "idle": 0.0}
+        self.last_activity = time.monotonic()
+
+    def wake(self):
+        """Switch back to the full frame rate"""
+        self.last_activity = time.monotonic()
+        self.mode = "active"
+
+    def tick(self, busy=False):
+        """Wait for the next frame and return the elapsed time in milliseconds"""
+        if busy:
+            self.wake()
+        elif self.mode == "active" and time.monotonic() - self.last_activity > self.idle_after:
+            self.mode = "idle"
+
+        mode = self.mode
+        if mode == "active":
+            elapsed = self.clock.tick(self.active_fps)
+        else:
+            # Sleep until input arrives or the next idle frame is due
+            event = pygame.event.wait(int(1000 / self.idle_fps))
+            if event.type != pygame.NOEVENT:
+                # Put it back for the hub's regular event handling
+                pygame.event.post(event)
+                self.wake()
+            elapsed = self.clock.tick()
+
+        self.mode_time[mode] += elapsed / 1000
+        return elapsed
+
+    def get_fps(self):
+        """Effective frame rate over the last few frames"""
+        return self.clock.get_fps()
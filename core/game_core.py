@@ -0,0 +1,38 @@
+import random
+
+def make_rng(seed=None):
+    """Create a game's private RNG, returns (rng, seed)
+
+    A fresh seed is drawn when none is given, and it is returned so
+    the session can be reproduced later.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    return random.Random(seed), seed
+
+
+class FixedTimestep:
+    """Turns real frame time into a whole number of fixed simulation ticks"""
+
+    def __init__(self, tick_rate, max_ticks_per_frame=5):
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+        self.dropped_ticks = 0  # Ticks skipped because a frame took too long
+
+    def advance(self, elapsed_ms):
+        """Add a frame's elapsed time and return how many ticks to simulate"""
+        self.accumulator += elapsed_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        self.accumulator -= ticks * self.tick_ms
+
+        # After a long stall, catch up a little rather than freezing on a backlog
+        if ticks > self.max_ticks_per_frame:
+            self.dropped_ticks += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+        return ticks
+
+    def reset(self):
+        """Forget any partial tick (e.g. after a pause or restart)"""
+        self.accumulator = 0.0
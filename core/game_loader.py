@@ -1,6 +1,10 @@
 import os
+import ast
+import json
+import hashlib
 import importlib.util
 import sys
+import threading
 
 class GameLoader:
     """Loads and manages games from the games directory"""
@@ -9,16 +13,93 @@ class GameLoader:
         self.games = {}
         self.games_path = "games"
         
+        # Game metadata cached between runs, keyed by each main.py's mtime and hash
+        self.manifest_path = os.path.join("config", "game_manifest.json")
+        self.manifest = None
+        self.manifest_hits = 0    # Games found by the last scan whose metadata was cached
+        self.manifest_misses = 0  # ...and those whose main.py had to be read
+        
+        # Games can be imported by the pre-warm threads and the hub at once
+        self.import_lock = threading.RLock()
+        
     def discover_games(self):
-        """Scan the games directory and load available games"""
+        """Scan the games directory for available games without importing them
+        
+        Each game's GAME_INFO is read statically from its main.py (or from the
+        manifest cache when the file hasn't changed); the module itself is only
+        imported when the game is first launched.
+        """
         if not os.path.exists(self.games_path):
             print(f"Error: Games directory '{self.games_path}' not found")
             return {}
+        
+        if self.manifest is None:
+            self.manifest = self.load_manifest()
+        manifest_changed = False
+        self.manifest_hits = self.manifest_misses = 0
+        previous_games = self.games
+        self.games = {}
             
         # Look for game directories
+        for game_dir in self.game_dirs():
+            main_path = os.path.join(self.games_path, game_dir, "main.py")
+            try:
+                stat = os.stat(main_path)
+                entry = self.manifest.get(game_dir)
+                if not entry or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size:
+                    # Touched (or new): only re-read GAME_INFO if the contents changed
+                    with open(main_path, 'rb') as f:
+                        source = f.read()
+                    digest = hashlib.sha1(source).hexdigest()
+                    if not entry or entry["sha1"] != digest:
+                        entry = {"sha1": digest, "info": self.read_game_info(game_dir, source)}
+                    entry.update(mtime=stat.st_mtime, size=stat.st_size)
+                    self.manifest[game_dir] = entry
+                    manifest_changed = True
+                    self.manifest_misses += 1
+                else:
+                    self.manifest_hits += 1
+                
+                if entry["info"] is None:
+                    continue  # Invalid GAME_INFO, reported when it was read
+                game_info = dict(entry["info"], directory=game_dir)
+                
+                # Keep an already imported module if its source is unchanged
+                previous = previous_games.get(game_dir)
+                if previous and "module" in previous and previous.get("sha1") == entry["sha1"]:
+                    game_info["module"] = previous["module"]
+                    game_info["modules"] = previous.get("modules")
+                game_info["sha1"] = entry["sha1"]
+                self.games[game_dir] = game_info
+            except Exception as e:
+                print(f"Error loading game '{game_dir}': {e}")
+        
+        # Drop the modules of games that changed or disappeared
+        for game_dir, previous in previous_games.items():
+            if "module" in previous and self.games.get(game_dir, {}).get("module") is not previous["module"]:
+                self.unload_modules(game_dir, previous)
+        
+        # Forget games that were removed
+        for game_dir in set(self.manifest) - set(self.games):
+            if not os.path.exists(os.path.join(self.games_path, game_dir, "main.py")):
+                del self.manifest[game_dir]
+                manifest_changed = True
+        if manifest_changed:
+            self.save_manifest()
+        
+        # Debug output
+        print(f"Total games found: {len(self.games)} ({self.manifest_hits} cached, "
+              f"{self.manifest_misses} read)")
+        print(f"Game IDs: {', '.join(self.games.keys())}")
+        
+        return self.games
+    
+    def game_dirs(self):
+        """Names of the directories under games_path that hold a game (a main.py)"""
+        if not os.path.isdir(self.games_path):
+            return []
+        game_dirs = []
         for game_dir in os.listdir(self.games_path):
-            game_path = os.path.join(self.games_path, game_dir)
-            
             # Skip directories starting with "-" or "." and non-directories
             if game_dir.startswith("-") or game_dir.startswith("."):
                 continue
@@ -28,21 +109,60 @@ class GameLoader:
                 continue
             
             # Check if it's a directory and has a main.py file
-            if os.path.isdir(game_path) and os.path.exists(os.path.join(game_path, "main.py")):
+            if os.path.isfile(os.path.join(self.games_path, game_dir, "main.py")):
+                game_dirs.append(game_dir)
+        return game_dirs
+    
+    def read_game_info(self, game_dir, source):
+        """Extract GAME_INFO from a game's source with ast, without running it"""
+        tree = ast.parse(source, filename=os.path.join(self.games_path, game_dir, "main.py"))
+        for node in tree.body:
+            if (isinstance(node, ast.Assign) and len(node.targets) == 1 and
+                    isinstance(node.targets[0], ast.Name) and node.targets[0].id == "GAME_INFO"):
                 try:
-                    # Import the game module
+                    game_info = ast.literal_eval(node.value)
+                except ValueError:
+                    # Not a plain literal, fall back to running the module
                     game_info = self.load_game_info(game_dir)
-                    if game_info:
-                        self.games[game_dir] = game_info
-                        print(f"Loaded game: {game_info.get('title', game_dir)}")
-                except Exception as e:
-                    print(f"Error loading game '{game_dir}': {e}")
-        
-        # Debug output
-        print(f"Total games found: {len(self.games)}")
-        print(f"Game IDs: {', '.join(self.games.keys())}")
+                    return game_info and {key: value for key, value in game_info.items()
+                                          if key not in ("module", "directory")}
+                
+                # Validate GAME_INFO is a dictionary
+                if not isinstance(game_info, dict):
+                    print(f"Invalid GAME_INFO format in {game_dir}")
+                    return None
+                return game_info
         
-        return self.games
+        # Create default game info
+        return {
+            "title": game_dir.replace("_", " ").title(),
+            "description": "No description available",
+            "author": "Unknown",
+            "version": "1.0"
+        }
+    
+    def load_manifest(self):
+        """Load the cached game metadata"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict) and manifest.get("games_path") == os.path.realpath(self.games_path):
+                return manifest["games"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+    
+    def save_manifest(self):
+        """Write the cached game metadata atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            temp_path = self.manifest_path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"games_path": os.path.realpath(self.games_path), "games": self.manifest},
+                          f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Error saving game manifest: {e}")
     
     def load_game_info(self, game_dir):
         """Load game information from the game's main module"""
@@ -75,6 +195,7 @@ class GameLoader:
                 spec.loader.exec_module(module)
             except Exception as e:
                 print(f"Error executing game module '{game_dir}': {e}")
+                sys.modules.pop(spec.name, None)
                 return None
             
             # Check if the module has the required attributes
@@ -103,14 +224,115 @@ class GameLoader:
             print(f"Error importing game '{game_dir}': {e}")
             return None
     
-    def launch_game(self, game_id):
-        """Launch a game by its ID (directory name)"""
+    def get_module(self, game_id):
+        """Import a discovered game's module once, returns it (None on failure)"""
+        with self.import_lock:
+            game_info = self.games[game_id]
+            if game_info.get("module") is None:
+                loaded = self.load_game_info(game_id)
+                game_info["module"] = loaded and loaded["module"]
+                game_info["modules"] = self.find_game_modules(game_id)
+            return game_info["module"]
+    
+    def find_game_modules(self, game_id):
+        """Names of the loaded modules whose source lives in a game's directory
+        
+        Covers the game's main module plus any sibling modules it imported,
+        whether as games.<id>.helpers, relatively, or by a plain name after
+        adding its own directory to sys.path.
+        """
+        game_path = os.path.realpath(os.path.join(self.games_path, game_id)) + os.sep
+        package = f"games.{game_id}"  # Its package holds the submodules as attributes too
+        modules = []
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if (name == package or name.startswith(package + ".") or
+                    (path and os.path.realpath(path).startswith(game_path))):
+                modules.append(name)
+        return modules
+    
+    def source_files(self, game_id):
+        """(mtime, size) of every Python file in a game's directory, by path"""
+        files = {}
+        for root, dirs, names in os.walk(os.path.join(self.games_path, game_id)):
+            dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".")]
+            for name in names:
+                if name.endswith(".py"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # Deleted while scanning
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+    
+    def unload_modules(self, game_id, game_info):
+        """Evict a game's modules from sys.modules so the next import reads fresh source"""
+        with self.import_lock:
+            for name in game_info.pop("modules", None) or self.find_game_modules(game_id):
+                sys.modules.pop(name, None)
+            game_info.pop("module", None)
+        
+        # .pyc files only record the source's mtime to the second and its size,
+        # so a quick edit that keeps the size would load the old bytecode
+        for path in self.source_files(game_id):
+            try:
+                os.remove(importlib.util.cache_from_source(path))
+            except OSError:
+                pass
+        importlib.invalidate_caches()
+    
+    def reload_game(self, game_id):
+        """Re-read one game after its sources changed and import it again
+        
+        Only this game's modules are evicted and re-imported; every other
+        game (and the manifest entries of the rest) are left alone.
+        Returns the new game info, or None if the game is gone or broken.
+        """
+        with self.import_lock:
+            if self.manifest is None:
+                self.manifest = self.load_manifest()
+            previous = self.games.pop(game_id, None)
+            if previous:
+                self.unload_modules(game_id, previous)
+            
+            main_path = os.path.join(self.games_path, game_id, "main.py")
+            if not os.path.exists(main_path):
+                self.manifest.pop(game_id, None)
+                self.save_manifest()
+                print(f"Game '{game_id}' was removed")
+                return None
+            
+            try:
+                stat = os.stat(main_path)
+                with open(main_path, 'rb') as f:
+                    source = f.read()
+                digest = hashlib.sha1(source).hexdigest()
+                entry = self.manifest.get(game_id)
+                if not entry or entry["sha1"] != digest:
+                    entry = {"sha1": digest, "info": self.read_game_info(game_id, source)}
+                entry.update(mtime=stat.st_mtime, size=stat.st_size)
+                self.manifest[game_id] = entry
+                self.save_manifest()
+            except Exception as e:
+                print(f"Error reloading game '{game_id}': {e}")
+                return None
+            
+            if entry["info"] is None:
+                return None
+            self.games[game_id] = dict(entry["info"], directory=game_id, sha1=entry["sha1"])
+            if not self.get_module(game_id):
+                return None
+            return self.games[game_id]
+    
+    def launch_game(self, game_id, **options):
+        """Launch a game by its ID (directory name), passing options to its constructor"""
         if not self.games or game_id not in self.games:
             print(f"Game '{game_id}' not found")
             return None
             
-        game_info = self.games[game_id]
-        module = game_info.get("module")
+        # Games are imported on first launch (or by the pre-warm)
+        module = self.get_module(game_id)
         
         if not module:
             print(f"Module for game '{game_id}' is missing")
@@ -118,7 +340,7 @@ class GameLoader:
         
         try:
             if hasattr(module, "Game"):
-                game = module.Game()
+                game = module.Game(**options)
                 return game
             else:
                 print(f"Game '{game_id}' does not have a Game class")
@@ -2,6 +2,8 @@ import pygame
 import os
 import math
 import random
+from core.text_cache import TextCache
+from core.particles import ParticlePool
 
 class GUIManager:
     """Manages GUI components and styling for the arcade hub"""
@@ -21,10 +23,26 @@ class GUIManager:
             'light_text': (255, 255, 255),
             'grid_line': (20, 20, 40)
         }
+        self.text_cache = TextCache()
         self.load_fonts()
-        self.particles = []
+        self.particles = ParticlePool(capacity=settings.get("display", {}).get("max_particles", 4096))
         self.time = 0
         
+        # Static background layer, rebuilt when the window size changes
+        self.background = None
+        self.stars = []
+        
+        # Dirty-rectangle tracking (opt-in, see ArcadeHub.render)
+        self.dirty_tracking = False
+        self.frame_regions = {}
+        self.last_frame_regions = {}
+        self.forced_dirty = []
+        self.last_particle_bounds = None
+        
+        # Hovered widgets, used to tell whether the menu is idle
+        self.hovered = set()
+        self.last_hovered = set()
+        
     def load_fonts(self):
         """Load fonts for the GUI"""
         # Use clear, bold fonts that look arcade-like
@@ -32,26 +50,90 @@ class GUIManager:
         self.fonts['heading'] = pygame.font.SysFont("arial", 32, bold=True)
         self.fonts['normal'] = pygame.font.SysFont("arial", 24, bold=True)
         self.fonts['small'] = pygame.font.SysFont("arial", 18, bold=True)
+        
+        # Cached surfaces were rendered with the old fonts
+        self.text_cache.clear()
     
-    def update(self):
+    def update(self, steps=1):
         """Update animations and effects"""
-        self.time += 1
+        # Animation time is counted in 60 FPS frames, so pulses keep
+        # their speed when the hub drops to a lower frame rate
+        self.time += steps
         
         # Update particles
-        for particle in self.particles[:]:
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-            else:
-                particle['x'] += particle['dx']
-                particle['y'] += particle['dy']
+        self.particles.update()
     
-    def draw_background(self):
-        """Draw retro grid background"""
+    def track_region(self, rect, signature):
+        """Record what was drawn into a screen region this frame"""
+        if not self.dirty_tracking:
+            return
+        key = (int(rect[0]), int(rect[1]), int(rect[2]), int(rect[3]))
+        self.frame_regions[key] = self.frame_regions.get(key, ()) + (signature,)
+    
+    def mark_dirty(self, rect):
+        """Force a region to be pushed to the display this frame"""
+        if self.dirty_tracking and rect:
+            self.forced_dirty.append(pygame.Rect(rect))
+    
+    def collect_dirty_rects(self):
+        """Return the screen regions that changed since the previous frame"""
+        dirty = self.forced_dirty
+        
+        # Regions that are new or whose contents changed
+        for key, signature in self.frame_regions.items():
+            if self.last_frame_regions.get(key) != signature:
+                dirty.append(pygame.Rect(key))
+        
+        # Regions that were drawn last frame but not this one
+        for key in self.last_frame_regions:
+            if key not in self.frame_regions:
+                dirty.append(pygame.Rect(key))
+        
+        self.last_frame_regions = self.frame_regions
+        self.frame_regions = {}
+        self.forced_dirty = []
+        
+        # Clip to the window and drop rects already covered by a bigger one.
+        # Overlapping rects are not unioned, since joining the thin border
+        # strips of a panel would cover the whole panel again.
+        screen_rect = self.screen.get_rect()
+        clipped = [rect.clip(screen_rect) for rect in dirty]
+        clipped.sort(key=lambda rect: rect.width * rect.height, reverse=True)
+        
+        merged = []
+        for rect in clipped:
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            if not any(existing.contains(rect) for existing in merged):
+                merged.append(rect)
+        
+        return merged
+    
+    def is_animating(self):
+        """Check if anything needs full-rate frames (particles or hover changes)"""
+        hover_changed = self.hovered != self.last_hovered
+        self.last_hovered = self.hovered
+        self.hovered = set()
+        return bool(self.particles) or hover_changed
+    
+    def set_screen(self, screen):
+        """Point the GUI at a new display surface (e.g. after a resize)"""
+        self.screen = screen
+        self.invalidate_background()
+    
+    def invalidate_background(self):
+        """Force the static background layer to be rebuilt on the next draw"""
+        self.background = None
+    
+    def build_background(self):
+        """Render the static grid once for the current window size"""
         width, height = self.screen.get_size()
         
+        # Match the display's pixel format so blits don't need conversion
+        background = pygame.Surface((width, height), 0, self.screen)
+        
         # Draw dark background
-        self.screen.fill(self.colors['dark_bg'])
+        background.fill(self.colors['dark_bg'])
         
         # Draw grid lines
         grid_spacing = 40
@@ -59,38 +141,58 @@ class GUIManager:
         
         # Draw horizontal grid lines
         for y in range(0, height, grid_spacing):
-            pygame.draw.line(self.screen, grid_color, (0, y), (width, y), 1)
+            pygame.draw.line(background, grid_color, (0, y), (width, y), 1)
         
         # Draw vertical grid lines
         for x in range(0, width, grid_spacing):
-            pygame.draw.line(self.screen, grid_color, (x, 0), (x, height), 1)
+            pygame.draw.line(background, grid_color, (x, 0), (x, height), 1)
         
-        # Draw some random stars
+        # Scatter a fixed set of stars that twinkle instead of jumping around
+        self.stars = []
         for _ in range(20):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            size = random.randint(1, 3)
-            brightness = random.randint(150, 255)
-            pygame.draw.circle(self.screen, (brightness, brightness, brightness), (x, y), size)
+            self.stars.append({
+                'x': random.randint(0, width),
+                'y': random.randint(0, height),
+                'size': random.randint(1, 3),
+                'brightness': random.randint(150, 255),
+                'phase': random.uniform(0, math.pi * 2),
+                'speed': random.uniform(0.02, 0.06)
+            })
+        
+        self.background = background
     
-    def draw_text(self, text, font_name, color, x, y, align="center", glow=False, shadow=True):
-        """Draw text on the screen with specified alignment and effects"""
+    def draw_background(self):
+        """Draw retro grid background"""
+        if self.background is None or self.background.get_size() != self.screen.get_size():
+            self.build_background()
+        
+        # Static grid is a single blit
+        self.screen.blit(self.background, (0, 0))
+        
+        # Twinkling stars overlay
+        for star in self.stars:
+            twinkle = (math.sin(self.time * star['speed'] + star['phase']) + 1) * 0.5
+            brightness = int(star['brightness'] * (0.6 + 0.4 * twinkle))
+            pygame.draw.circle(self.screen, (brightness, brightness, brightness), 
+                              (star['x'], star['y']), star['size'])
+            
+            size = star['size']
+            self.track_region((star['x'] - size, star['y'] - size, size * 2 + 1, size * 2 + 1), 
+                              brightness)
+    
+    def render_text_layers(self, text, font_name, color_value, glow, shadow):
+        """Return the cached (surface, offset) layers for a text variant"""
+        key = (text, font_name, tuple(color_value), glow, shadow)
+        layers = self.text_cache.get(key)
+        if layers is not None:
+            return layers
+        
         font = self.fonts.get(font_name, self.fonts['normal'])
-        color_value = self.colors.get(color, color)
+        layers = []
         
         # Always draw shadow for better visibility
         if shadow:
-            shadow_surface = font.render(text, True, (0, 0, 0))
-            shadow_rect = shadow_surface.get_rect()
-            
-            if align == "center":
-                shadow_rect.center = (x + 2, y + 2)
-            elif align == "left":
-                shadow_rect.topleft = (x + 2, y + 2)
-            elif align == "right":
-                shadow_rect.topright = (x + 2, y + 2)
-                
-            self.screen.blit(shadow_surface, shadow_rect)
+            layers.append((font.render(text, True, (0, 0, 0)), (2, 2)))
         
         # Draw glow effect for better visibility
         if glow:
@@ -99,22 +201,23 @@ class GUIManager:
             for i in range(3):
                 glow_color[i] = min(255, glow_color[i] + 50)
             
-            for offset_x, offset_y in [(-glow_size, 0), (glow_size, 0), (0, -glow_size), (0, glow_size)]:
-                glow_surface = font.render(text, True, glow_color)
-                glow_rect = glow_surface.get_rect()
-                
-                if align == "center":
-                    glow_rect.center = (x + offset_x, y + offset_y)
-                elif align == "left":
-                    glow_rect.topleft = (x + offset_x, y + offset_y)
-                elif align == "right":
-                    glow_rect.topright = (x + offset_x, y + offset_y)
-                    
-                self.screen.blit(glow_surface, glow_rect)
-        
-        # Draw main text
-        text_surface = font.render(text, True, color_value)
-        text_rect = text_surface.get_rect()
+            # All four offsets share one rendered surface
+            glow_surface = font.render(text, True, glow_color)
+            for offset in [(-glow_size, 0), (glow_size, 0), (0, -glow_size), (0, glow_size)]:
+                layers.append((glow_surface, offset))
+        
+        # Main text goes last so it is drawn on top
+        layers.append((font.render(text, True, color_value), (0, 0)))
+        
+        return self.text_cache.put(key, layers)
+    
+    def draw_text(self, text, font_name, color, x, y, align="center", glow=False, shadow=True):
+        """Draw text on the screen with specified alignment and effects"""
+        color_value = self.colors.get(color, color)
+        layers = self.render_text_layers(text, font_name, color_value, glow, shadow)
+        
+        # Every layer has the same size, so anchor on the main text
+        text_rect = layers[-1][0].get_rect()
         
         if align == "center":
             text_rect.center = (x, y)
@@ -122,8 +225,12 @@ class GUIManager:
             text_rect.topleft = (x, y)
         elif align == "right":
             text_rect.topright = (x, y)
-            
-        self.screen.blit(text_surface, text_rect)
+        
+        for surface, (offset_x, offset_y) in layers:
+            self.screen.blit(surface, text_rect.move(offset_x, offset_y))
+        
+        # Shadow and glow spill up to 2px around the text
+        self.track_region(text_rect.inflate(4, 4), (text, font_name, tuple(color_value), glow, shadow))
         return text_rect
     
     def draw_button(self, text, font_name, x, y, width, height, idle_color, hover_color=None, align="center"):
@@ -145,6 +252,7 @@ class GUIManager:
         # Check hover state
         hovered = button_rect.collidepoint(mouse_pos)
         if hovered:
+            self.hovered.add(tuple(button_rect))
             color = hover_color
             if pygame.mouse.get_pressed()[0]:
                 clicked = True
@@ -171,18 +279,12 @@ class GUIManager:
             pygame.draw.rect(self.screen, border_color, 
                             button_rect.inflate(12, 12), 1, border_radius=9)
         
-        # Draw text with shadow
-        font = self.fonts.get(font_name, self.fonts['normal'])
-        
-        # Shadow
-        shadow_surface = font.render(text, True, (0, 0, 0))
-        shadow_rect = shadow_surface.get_rect(center=(button_rect.center[0] + 2, button_rect.center[1] + 2))
-        self.screen.blit(shadow_surface, shadow_rect)
+        # Outer glow reaches 6px past the button
+        self.track_region(button_rect.inflate(14, 14), (tuple(color), hovered))
         
-        # Main text
-        text_surface = font.render(text, True, self.colors['light_text'])
-        text_rect = text_surface.get_rect(center=button_rect.center)
-        self.screen.blit(text_surface, text_rect)
+        # Draw text with shadow
+        self.draw_text(text, font_name, 'light_text', 
+                      button_rect.centerx, button_rect.centery, shadow=True)
         
         return clicked, button_rect
     
@@ -215,6 +317,15 @@ class GUIManager:
                             (x-2, y-2, width+4, height+4), 2, border_radius=4)
             pygame.draw.rect(self.screen, (*glow_color, 100), 
                             (x-4, y-4, width+8, height+8), 1, border_radius=5)
+            
+            # Only the border pulses, so track it as four thin strips
+            glow_signature = tuple(glow_color)
+            self.track_region((x - 4, y - 4, width + 8, 8), glow_signature)
+            self.track_region((x - 4, y + height - 4, width + 8, 8), glow_signature)
+            self.track_region((x - 4, y - 4, 8, height + 8), glow_signature)
+            self.track_region((x + width - 4, y - 4, 8, height + 8), glow_signature)
+        
+        self.track_region((x, y, width, height), ('panel', tuple(color[:3]), alpha))
         
         return pygame.Rect(x, y, width, height)
     
@@ -230,11 +341,11 @@ class GUIManager:
         offsets = [(4, 4), (2, 2), (0, 0)]
         
         for color, offset in zip(colors, offsets):
-            self.draw_text(text, 'title', color, x + offset[0], y + offset[1], 
-                          align="center", shadow=True)
+            text_rect = self.draw_text(text, 'title', color, x + offset[0], y + offset[1], 
+                                      align="center", shadow=True)
         
         # Add some decorative elements
-        width = self.fonts['title'].size(text)[0]
+        width = text_rect.width
         line_y = y + 30
         line_length = width * 0.8
         
@@ -247,30 +358,20 @@ class GUIManager:
                           (int(x - line_length/2), line_y), 5)
         pygame.draw.circle(self.screen, self.colors['neon_pink'], 
                           (int(x + line_length/2), line_y), 5)
+        
+        self.track_region((x - line_length/2 - 6, line_y - 6, line_length + 12, 13), ('title', text))
     
     def add_particles(self, x, y, count, color):
         """Add particles for visual effects"""
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(1, 3)
-            size = random.randint(2, 4)
-            life = random.randint(20, 40)
-            
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'dx': math.cos(angle) * speed,
-                'dy': math.sin(angle) * speed,
-                'size': size,
-                'color': color,
-                'life': life
-            })
+        self.particles.emit(x, y, count, color)
     
     def draw_particles(self):
         """Draw all active particles"""
-        for particle in self.particles:
-            alpha = min(255, int(255 * (particle['life'] / 40)))
-            color = list(particle['color'])
-            pygame.draw.circle(self.screen, (*color[:3], alpha), 
-                              (int(particle['x']), int(particle['y'])), 
-                              particle['size'])
\ No newline at end of file
+        if self.dirty_tracking:
+            # Particles move every frame, so refresh where they were and are
+            bounds = self.particles.bounds()
+            self.mark_dirty(bounds)
+            self.mark_dirty(self.last_particle_bounds)
+            self.last_particle_bounds = bounds
+        
+        self.particles.draw(self.screen)
@@ -0,0 +1,53 @@
+from core.game_loader import GameLoader
+
+class HeadlessGame:
+    """Runs a game's simulation without a window, fonts or frame cap"""
+
+    def __init__(self, game_id, games_path="games", **options):
+        """options are passed on to the game's constructor (e.g. Snake's board size)"""
+        self.game_id = game_id
+
+        # Reuse the loader's validation and module import
+        loader = GameLoader()
+        loader.games_path = games_path
+        game_info = loader.load_game_info(game_id)
+        if not game_info or not hasattr(game_info["module"], "Game"):
+            raise ValueError(f"Game '{game_id}' could not be loaded")
+
+        self.game = game_info["module"].Game(headless=True, **options)
+        if not hasattr(self.game, "step"):
+            raise ValueError(f"Game '{game_id}' does not support headless mode")
+
+        # Action names understood by this game, mapped to pygame keys
+        self.actions = getattr(self.game, "ACTIONS", {})
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Start a new episode and return the initial state"""
+        self.steps = 0
+        return self.game.reset(seed)
+
+    def step(self, actions=()):
+        """Advance one simulation tick, returns (state, reward, done)
+
+        actions can be action names from the game's ACTIONS table or raw
+        pygame key codes; they count as pressed for this tick. Names the
+        game doesn't use are ignored, so one agent can play every game.
+        """
+        keys = [self.actions.get(action) if isinstance(action, str) else action
+                for action in actions]
+        keys = [key for key in keys if key is not None]
+        self.steps += 1
+        return self.game.step(keys)
+
+    def run_episode(self, agent, max_steps=100000, seed=None):
+        """Play one episode with an agent callable, returns (score, steps)
+
+        The agent is called with the current state and returns the actions
+        to press for the next tick.
+        """
+        state = self.reset(seed)
+        done = False
+        while not done and self.steps < max_steps:
+            state, _, done = self.step(agent(state) or ())
+        return state["score"], self.steps
@@ -0,0 +1,123 @@
+import math
+import numpy as np
+import pygame
+
+class ParticlePool:
+    """Fixed-capacity particle system stored as parallel NumPy arrays"""
+
+    def __init__(self, capacity=4096, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        # One array per particle attribute, live particles are packed at the front
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.size = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.int16)  # Index into self.palette_colors
+
+        # Colors and pre-rendered circle sprites, shared by all particles
+        self.palette = {}
+        self.palette_colors = []
+        self.sprites = {}
+        self.dropped = 0  # Particles refused because the pool was full
+
+    def emit(self, x, y, count, color):
+        """Spawn a burst of particles at a point, returns how many were added"""
+        requested = count
+        count = min(count, self.capacity - self.count)
+        self.dropped += requested - max(0, count)
+        if count <= 0:
+            return 0
+
+        start, end = self.count, self.count + count
+        angle = self.rng.uniform(0, math.pi * 2, count)
+        speed = self.rng.uniform(1, 3, count)
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.dx[start:end] = np.cos(angle) * speed
+        self.dy[start:end] = np.sin(angle) * speed
+        self.size[start:end] = self.rng.integers(2, 5, count)
+        self.life[start:end] = self.rng.integers(20, 41, count)
+        color = tuple(color[:3])
+        if color not in self.palette:
+            self.palette[color] = len(self.palette_colors)
+            self.palette_colors.append(color)
+        self.color[start:end] = self.palette[color]
+
+        self.count = end
+        return count
+
+    def update(self):
+        """Age all particles, drop the dead ones and move the rest"""
+        n = self.count
+        if not n:
+            return
+
+        self.life[:n] -= 1
+        alive = self.life[:n] > 0
+
+        # Compact live particles to the front of every array
+        if not alive.all():
+            for values in (self.x, self.y, self.dx, self.dy, self.life, self.size, self.color):
+                live = values[:n][alive]
+                values[:len(live)] = live
+            n = self.count = int(alive.sum())
+
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+
+    def get_sprite(self, color_index, size):
+        """Pre-render a filled circle for a color and radius"""
+        key = (color_index, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            color = self.palette_colors[color_index]
+            sprite = pygame.Surface((size * 2 + 1, size * 2 + 1))
+            sprite.set_colorkey((0, 0, 0) if color != (0, 0, 0) else (255, 255, 255))
+            sprite.fill(sprite.get_colorkey())
+            pygame.draw.circle(sprite, color, (size, size), size)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface):
+        """Draw every particle with a single batched blit call"""
+        n = self.count
+        if not n:
+            return
+
+        sizes = self.size[:n]
+        left = (self.x[:n].astype(np.int32) - sizes).tolist()
+        top = (self.y[:n].astype(np.int32) - sizes).tolist()
+
+        # Map each particle to its sprite through a small lookup table
+        codes = self.color[:n].astype(np.int32) * 8 + sizes
+        table = {code: self.get_sprite(code // 8, code % 8) for code in np.unique(codes).tolist()}
+        sprites = [table[code] for code in codes.tolist()]
+
+        surface.blits(zip(sprites, zip(left, top)), doreturn=False)
+
+    def bounds(self):
+        """Bounding rect of all live particles, or None if there are none"""
+        n = self.count
+        if not n:
+            return None
+        sizes = self.size[:n]
+        xs = self.x[:n].astype(np.int32)
+        ys = self.y[:n].astype(np.int32)
+        left = int((xs - sizes).min())
+        top = int((ys - sizes).min())
+        right = int((xs + sizes).max()) + 1
+        bottom = int((ys + sizes).max()) + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,91 @@
+import time
+import threading
+from collections import OrderedDict
+
+class PersistenceWorker:
+    """Runs file writes on a background thread, coalescing repeated writes
+
+    Each write is submitted under a key. While a key is still waiting,
+    a newer write replaces it (settings: only the latest copy matters)
+    or is merged into it with a combine function (scores: one batch).
+    The queue holds at most max_pending keys; submit blocks when it is
+    full rather than letting writes pile up without bound.
+    """
+
+    def __init__(self, max_pending=32):
+        self.max_pending = max_pending
+        self.pending = OrderedDict()  # key -> [func, payload, combine, submit time]
+        self.busy = False
+        self.running = True
+        self.condition = threading.Condition()
+
+        # Counters for the debug overlay
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0
+        self.last_latency = 0.0  # Seconds from submit to write finished
+        self.max_latency = 0.0
+
+        self.thread = threading.Thread(target=self.run, name="persistence", daemon=True)
+        self.thread.start()
+
+    @property
+    def depth(self):
+        """Writes waiting to run (including the one in progress)"""
+        return len(self.pending) + self.busy
+
+    def submit(self, key, func, payload, combine=None):
+        """Queue func(payload), merging with a waiting write under the same key"""
+        if not self.running:
+            func(payload)  # Shut down already, write synchronously
+            return
+
+        with self.condition:
+            self.submitted += 1
+            if key in self.pending:
+                job = self.pending[key]
+                job[1] = combine(job[1], payload) if combine else payload
+                self.coalesced += 1
+                return
+
+            while len(self.pending) >= self.max_pending and self.running:
+                self.condition.wait()
+            self.pending[key] = [func, payload, combine, time.perf_counter()]
+            self.condition.notify_all()
+
+    def run(self):
+        """Worker thread: perform queued writes in submission order"""
+        while True:
+            with self.condition:
+                while not self.pending and self.running:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                _, (func, payload, _, submitted) = self.pending.popitem(last=False)
+                self.busy = True
+                self.condition.notify_all()
+
+            try:
+                func(payload)
+            except Exception as e:
+                print(f"Error in background write: {e}")
+
+            with self.condition:
+                self.busy = False
+                self.written += 1
+                self.last_latency = time.perf_counter() - submitted
+                self.max_latency = max(self.max_latency, self.last_latency)
+                self.condition.notify_all()
+
+    def flush(self):
+        """Block until every queued write has finished"""
+        with self.condition:
+            while self.pending or self.busy:
+                self.condition.wait()
+
+    def close(self):
+        """Finish queued writes and stop the worker thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join()
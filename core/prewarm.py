@@ -0,0 +1,85 @@
+import os
+import time
+import inspect
+import threading
+import compileall
+from concurrent.futures import ThreadPoolExecutor
+
+class Prewarmer:
+    """Gets games ready to launch on background threads while the menu is shown
+
+    For each game: byte-compile its sources, import the module, and load
+    its fonts and sounds into the shared asset cache, so that a later
+    launch_game only has to build the Game object.
+    """
+
+    def __init__(self, game_loader, workers=4):
+        self.loader = game_loader
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prewarm")
+        self.futures = {}
+        self.timings = {}  # game_id -> {"compile", "import", "assets", "total"} in ms
+        self.started = None
+        self.elapsed = None  # Seconds from start() until every game was warm
+        self.lock = threading.RLock()  # Keeps done and elapsed in step
+
+    def start(self, game_ids=None):
+        """Queue every discovered game (or the given ones) that isn't warm yet"""
+        if self.started is None or self.done:
+            self.started = time.perf_counter()
+            self.elapsed = None
+        for game_id in game_ids or list(self.loader.games):
+            if game_id not in self.futures:
+                self.futures[game_id] = self.executor.submit(self.warm, game_id)
+
+    def forget(self, game_id):
+        """Let a changed game be warmed again"""
+        self.futures.pop(game_id, None)
+        self.timings.pop(game_id, None)
+
+    def warm(self, game_id):
+        """Warm one game, recording how long each stage took"""
+        start = time.perf_counter()
+        timings = {}
+        try:
+            # Write .pyc files so the import only has to load bytecode
+            compileall.compile_dir(os.path.join(self.loader.games_path, game_id), quiet=1)
+            stage = time.perf_counter()
+            timings["compile"] = (stage - start) * 1000
+
+            module = self.loader.get_module(game_id)
+            now = time.perf_counter()
+            timings["import"] = (now - stage) * 1000
+            stage = now
+
+            # Headless-capable games can load their assets without opening a window
+            game_class = getattr(module, "Game", None)
+            if game_class and "headless" in inspect.signature(game_class).parameters:
+                game = game_class(headless=True)
+                if hasattr(game, "load_assets"):
+                    game.load_assets()
+            timings["assets"] = (time.perf_counter() - stage) * 1000
+        except Exception as e:
+            print(f"Error pre-warming game '{game_id}': {e}")
+
+        timings["total"] = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.timings[game_id] = timings
+            if self.elapsed is None and self.done:
+                self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def ready(self):
+        return len(self.timings)
+
+    @property
+    def done(self):
+        with self.lock:
+            return all(game_id in self.timings for game_id in list(self.futures))
+
+    def report(self):
+        """One line per game with its warm-up timings"""
+        return [f"{game_id}: " + ", ".join(f"{stage} {ms:.1f} ms" for stage, ms in timings.items())
+                for game_id, timings in sorted(self.timings.items())]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
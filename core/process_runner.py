@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import signal
+import multiprocessing
+
+import pygame
+
+try:
+    import resource  # POSIX only; budgets aren't enforced without it
+except ImportError:
+    resource = None
+
+# Allow running as a script from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.game_loader import GameLoader
+
+
+def apply_limits(cpu_seconds=None, memory_mb=None):
+    """Cap this process's CPU time and address space (where supported)"""
+    if resource is None:
+        return
+    if cpu_seconds:
+        # RLIMIT_CPU counts from process start, so add the warm-up time already used
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        limit = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, resource.getrlimit(resource.RLIMIT_CPU)[1]))
+    if memory_mb:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+
+
+def _worker_main(connection, games_path, cpu_seconds, memory_mb):
+    """Worker process: warm up, wait for one game ID, play it, send the result back"""
+    # Pay for SDL's start-up before a game is asked for
+    pygame.init()
+    loader = GameLoader()
+    loader.games_path = games_path
+    connection.send(("ready", os.getpid()))
+
+    try:
+        request = connection.recv()
+    except (EOFError, KeyboardInterrupt):
+        return  # The hub went away
+    if request is None:
+        return  # Pool closed before this worker was used
+    game_id, options = request
+
+    apply_limits(cpu_seconds, memory_mb)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = {"score": None, "replay": None, "error": None}
+    game = None
+    try:
+        game_info = loader.load_game_info(game_id)
+        if not game_info or not hasattr(game_info["module"], "Game"):
+            raise ValueError(f"Game '{game_id}' could not be loaded")
+        game = game_info["module"].Game(**options)
+        score = result["score"] = game.start()
+
+        recorder = getattr(game, "recorder", None)
+        if recorder is not None and isinstance(score, (int, float)):
+            result["replay"] = recorder.to_bytes(game_id, score)
+    except MemoryError:
+        result["error"] = f"ran out of memory (budget {memory_mb} MB)"
+    except Exception as e:
+        result["error"] = str(e)
+
+    timestep = getattr(game, "timestep", None)
+    result["telemetry"] = {
+        "play_time": time.perf_counter() - start,
+        "cpu_time": time.process_time() - cpu_start,
+        "ticks": getattr(getattr(game, "recorder", None), "ticks", 0),
+        "dropped_ticks": getattr(timestep, "dropped_ticks", 0),
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None
+    }
+    connection.send(("result", result))
+    pygame.quit()
+
+
+class ProcessRunner:
+    """Plays games in worker processes, keeping warm workers ready in advance
+
+    Each game runs in its own process with its own window, so a game that
+    hangs or crashes can't take the hub down, and all of its memory goes
+    back to the system when it ends. Workers are started ahead of time
+    (pool_size of them, each with pygame already imported and initialised)
+    and every worker plays exactly one game, then exits; a replacement is
+    started as soon as one is taken. Optional per-game budgets cap the CPU
+    seconds and address space (in MB) a game may use.
+    """
+
+    def __init__(self, games_path="games", pool_size=1, cpu_seconds=None, memory_mb=None):
+        self.games_path = games_path
+        self.pool_size = pool_size
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+
+        # Fresh interpreters rather than forks of the hub, which owns SDL's window and threads
+        self.context = multiprocessing.get_context("spawn")
+        self.idle = []  # (process, connection) of workers waiting for a game
+        self.finishing = []  # Workers that sent their result and are shutting down
+        self.fill()
+
+    def fill(self):
+        """Start workers until pool_size are waiting, and reap finished ones"""
+        self.finishing = [process for process in self.finishing if process.is_alive()]
+        self.idle = [(process, connection) for process, connection in self.idle if process.is_alive()]
+        while len(self.idle) < self.pool_size:
+            self.idle.append(self.spawn())
+
+    def spawn(self):
+        parent, child = self.context.Pipe()
+        process = self.context.Process(target=_worker_main, name="game-worker", daemon=True,
+                                       args=(child, self.games_path, self.cpu_seconds, self.memory_mb))
+        process.start()
+        child.close()  # Only the worker holds this end, so its exit shows up as EOF
+        return process, parent
+
+    def run(self, game_id, wait=None, options=None):
+        """Play a game in a warm worker and return its result
+
+        The result is a dict with "score", "replay" (the session's replay
+        bytes, if the game records one), "telemetry" and "error" (None if
+        the game ended normally). wait, if given, is called about every
+        50 ms while the game runs, e.g. to keep the hub's window responsive.
+        options are passed on to the game's constructor.
+        """
+        self.fill()
+        process, connection = self.idle.pop(0)
+        self.fill()  # Warm the next worker while this game runs
+
+        start = time.perf_counter()
+        result = None
+        try:
+            connection.send((game_id, options or {}))
+        except OSError:
+            result = {"error": self.describe_exit(process)}  # Died while warming up
+        while result is None:
+            if connection.poll(0.05):
+                try:
+                    message, payload = connection.recv()
+                except (EOFError, OSError):
+                    result = {"error": self.describe_exit(process)}
+                    break
+                if message == "result":
+                    result = payload
+            elif not process.is_alive() and not connection.poll():
+                result = {"error": self.describe_exit(process)}
+            elif wait:
+                wait()
+
+        # Don't wait for the worker to tear down; it's reaped by a later fill()
+        connection.close()
+        self.finishing.append(process)
+
+        result.setdefault("score", None)
+        result.setdefault("replay", None)
+        result.setdefault("telemetry", {})["wall_time"] = time.perf_counter() - start
+        return result
+
+    def describe_exit(self, process):
+        """Why a worker ended without sending a result"""
+        process.join(timeout=2)
+        if resource and process.exitcode == -signal.SIGXCPU:
+            return f"exceeded its CPU budget ({self.cpu_seconds} s)"
+        return f"worker exited unexpectedly (exit code {process.exitcode})"
+
+    def close(self):
+        """Stop the idle workers"""
+        for process, connection in self.idle:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for process, connection in self.idle:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.kill()
+            connection.close()
+        self.idle = []
+
+        for process in self.finishing:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.kill()
+        self.finishing = []
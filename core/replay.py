@@ -0,0 +1,308 @@
+import os
+import sys
+import glob
+import time
+import argparse
+from collections import defaultdict
+
+import pygame
+
+# Allow running as a script from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.headless import HeadlessGame
+
+MAGIC = b"BBRP"
+VERSION = 3  # 2: the header records the game's simulation version, 3: and its options
+
+# Record opcodes, each followed by varint arguments
+OP_TICKS = 0  # count: ticks run with the current held keys
+OP_KEY = 1    # key: a KEYDOWN passed to handle_key
+OP_HELD = 2   # count, keys...: the held keys changed
+OP_END = 3    # score, ticks: end of the session
+
+# Held keys any game reads through pygame.key.get_pressed
+WATCHED_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_SPACE
+)
+
+
+class UnsupportedReplay(ValueError):
+    """A replay from an older file format or game simulation, which can't be re-run"""
+
+
+def replay_options(options):
+    """Check game options can be stored in a replay header, returns them as ints
+
+    Whole floats such as 20.0 are converted. Anything else that isn't a
+    non-negative int raises ValueError naming the option.
+    """
+    if not isinstance(options, dict):
+        raise ValueError(f"Game options must be a mapping of names to numbers, got {options!r}")
+    checked = {}
+    for option, value in options.items():
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if not isinstance(value, int) or value < 0:
+            raise ValueError(f"Option '{option}' must be a non-negative whole number, got {value!r}")
+        checked[option] = value
+    return checked
+
+
+def write_varint(buffer, value):
+    """Append a non-negative int as a little-endian base-128 varint"""
+    while value > 0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, pos):
+    """Read a varint at pos, returns (value, new pos)"""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    """Records the inputs a game's simulation reads, tick by tick"""
+
+    def __init__(self, seed, tick_rate, sim_version=1, options=None):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.sim_version = sim_version  # The game's SIM_VERSION
+        self.options = replay_options(options or {})  # Game() arguments needed to rebuild the session
+        self.data = bytearray()
+        self.held = ()
+        self.run = 0    # Ticks not yet written
+        self.ticks = 0
+
+    def key_down(self, key):
+        """Record a key press handed to the game's handle_key"""
+        self._flush()
+        self.data.append(OP_KEY)
+        write_varint(self.data, key)
+
+    def tick(self, pressed):
+        """Record one simulation tick and pass the pressed keys through to update"""
+        held = tuple(key for key in WATCHED_KEYS if pressed[key])
+        if held != self.held:
+            self._flush()
+            self.data.append(OP_HELD)
+            write_varint(self.data, len(held))
+            for key in held:
+                write_varint(self.data, key)
+            self.held = held
+
+        self.run += 1
+        self.ticks += 1
+        return pressed
+
+    def _flush(self):
+        """Write the pending run of unchanged ticks"""
+        if self.run:
+            self.data.append(OP_TICKS)
+            write_varint(self.data, self.run)
+            self.run = 0
+
+    def to_bytes(self, game_id, score):
+        """Encode the session with its game and final score"""
+        self._flush()
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        name = game_id.encode("utf-8")
+        write_varint(out, len(name))
+        out += name
+        write_varint(out, self.sim_version)
+        write_varint(out, self.seed)
+        write_varint(out, self.tick_rate)
+        options = replay_options(self.options)
+        write_varint(out, len(options))
+        for option, value in sorted(options.items()):
+            option = option.encode("utf-8")
+            write_varint(out, len(option))
+            out += option
+            write_varint(out, value)
+        out += self.data
+        out.append(OP_END)
+        write_varint(out, int(score))
+        write_varint(out, self.ticks)
+        return bytes(out)
+
+    def save(self, path, game_id, score):
+        """Write the replay file, returns its path"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes(game_id, score))
+        return path
+
+
+class Replay:
+    """A decoded replay file"""
+
+    def __init__(self, data):
+        if data[:4] != MAGIC:
+            raise ValueError("Not a replay file")
+        if data[4] != VERSION:
+            raise UnsupportedReplay(f"Unsupported replay version {data[4]}")
+
+        length, pos = read_varint(data, 5)
+        self.game_id = data[pos:pos + length].decode("utf-8")
+        self.sim_version, pos = read_varint(data, pos + length)
+        self.seed, pos = read_varint(data, pos)
+        self.tick_rate, pos = read_varint(data, pos)
+        self.options = {}
+        count, pos = read_varint(data, pos)
+        for _ in range(count):
+            length, pos = read_varint(data, pos)
+            option = data[pos:pos + length].decode("utf-8")
+            self.options[option], pos = read_varint(data, pos + length)
+        self.data = data
+        self.start = pos
+
+        # The claimed result sits in the END record
+        self.score = self.ticks = None
+        for op, args in self.records():
+            if op == OP_END:
+                self.score, self.ticks = args
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def records(self):
+        """Yield (opcode, args) for every record after the header"""
+        data = self.data
+        pos = self.start
+        while pos < len(data):
+            op = data[pos]
+            pos += 1
+            if op == OP_TICKS or op == OP_KEY:
+                value, pos = read_varint(data, pos)
+                yield op, value
+            elif op == OP_HELD:
+                count, pos = read_varint(data, pos)
+                keys = []
+                for _ in range(count):
+                    key, pos = read_varint(data, pos)
+                    keys.append(key)
+                yield op, keys
+            elif op == OP_END:
+                score, pos = read_varint(data, pos)
+                ticks, pos = read_varint(data, pos)
+                yield op, (score, ticks)
+            else:
+                raise ValueError(f"Corrupt replay: unknown record {op} at byte {pos - 1}")
+
+
+class ReplayPlayer:
+    """Feeds replays back into headless games as fast as they can run"""
+
+    def __init__(self, games_path="games"):
+        self.games_path = games_path
+        self.envs = {}  # One headless game per game ID and options, reused across replays
+
+    def play(self, replay):
+        """Re-run a replay, returns (score, ticks)
+
+        The game is built with the options the replay was recorded with.
+        Raises UnsupportedReplay if the replay was recorded with another
+        version of the game's simulation or another tick rate, either of
+        which would play out differently.
+        """
+        key = (replay.game_id, tuple(sorted(replay.options.items())))
+        env = self.envs.get(key)
+        if env is None:
+            env = self.envs[key] = HeadlessGame(replay.game_id, self.games_path, **replay.options)
+
+        game = env.game
+        sim_version = getattr(game, "SIM_VERSION", 1)
+        if replay.sim_version != sim_version:
+            raise UnsupportedReplay(f"Unsupported replay: recorded with simulation version "
+                             f"{replay.sim_version} of '{replay.game_id}', which is now at {sim_version}")
+        if replay.tick_rate != game.tick_rate:
+            raise UnsupportedReplay(f"Unsupported replay: recorded at {replay.tick_rate} ticks/s, "
+                                    f"'{replay.game_id}' runs at {game.tick_rate}")
+
+        game.reset(replay.seed)
+        keys = defaultdict(bool)
+        ticks = 0
+        for op, args in replay.records():
+            if op == OP_TICKS:
+                for _ in range(args):
+                    game.update(keys)
+                ticks += args
+            elif op == OP_KEY:
+                game.handle_key(args)
+            elif op == OP_HELD:
+                keys = defaultdict(bool, dict.fromkeys(args, True))
+
+        return game.score, ticks
+
+    def forget(self, game_id=None):
+        """Drop the cached game for one game ID (or all), e.g. after it was reloaded"""
+        if game_id is None:
+            self.envs.clear()
+        else:
+            for key in [key for key in self.envs if key[0] == game_id]:
+                del self.envs[key]
+
+    def verify(self, replay, score=None):
+        """Check a score (default: the one the replay claims) against the replay
+
+        Returns (ok, replayed score).
+        """
+        claimed = replay.score if score is None else score
+        replayed, ticks = self.play(replay)
+        return replayed == claimed and ticks == replay.ticks, replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back or verify recorded sessions")
+    parser.add_argument("command", choices=["play", "verify"])
+    parser.add_argument("replays", nargs="*", help="Replay files (default: config/replays/*.bbr)")
+    parser.add_argument("--games-path", default="games")
+    args = parser.parse_args()
+
+    paths = args.replays or sorted(glob.glob(os.path.join("config", "replays", "*.bbr")))
+    player = ReplayPlayer(args.games_path)
+    failures = stale = 0
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            replay = Replay.load(path)
+            if args.command == "play":
+                score, ticks = player.play(replay)
+            else:
+                ok, score = player.verify(replay)
+        except UnsupportedReplay as e:
+            # Older formats and simulations can't be re-run, which says nothing about the score
+            stale += 1
+            print(f"{path}: skipped, {e}")
+            continue
+
+        if args.command == "play":
+            elapsed = time.perf_counter() - start
+            print(f"{path}: {replay.game_id} score={score} ticks={ticks} "
+                  f"{elapsed * 1000:.1f} ms ({ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+        else:
+            failures += not ok
+            print(f"{path}: {replay.game_id} claimed={replay.score} replayed={score} "
+                  f"{'OK' if ok else 'MISMATCH'}")
+
+    if stale:
+        print(f"{stale} of {len(paths)} replays were recorded with an older format or game version")
+    if failures:
+        print(f"{failures} of {len(paths)} replays failed verification")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,569 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# Rollup periods, as strftime formats of the score's local time
+PERIODS = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m"
+}
+
+
+def period_labels(timestamp):
+    """The day and month a score was set in, e.g. {"day": "2025-06-19", "month": "2025-06"}"""
+    local = time.localtime(timestamp)
+    return {period: time.strftime(fmt, local) for period, fmt in PERIODS.items()}
+
+
+def add_to_rollup(rollup, score):
+    """Count a score into a rollup dict (count, sum, max, histogram)
+
+    Histogram bucket b holds scores in [2**(b-1), 2**b), bucket 0 holds 0.
+    """
+    bucket = max(0, int(score)).bit_length()
+    histogram = rollup.setdefault("histogram", [])
+    if len(histogram) <= bucket:
+        histogram.extend([0] * (bucket + 1 - len(histogram)))
+    histogram[bucket] += 1
+
+    rollup["max"] = max(rollup["max"], score) if rollup.get("count") else score
+    rollup["count"] = rollup.get("count", 0) + 1
+    rollup["sum"] = rollup.get("sum", 0) + score
+
+
+def merge_rollup(into, other):
+    """Fold one rollup dict into another"""
+    if not other.get("count"):
+        return
+    into["max"] = max(into["max"], other["max"]) if into.get("count") else other["max"]
+    into["count"] = into.get("count", 0) + other["count"]
+    into["sum"] = into.get("sum", 0) + other["sum"]
+    histogram = into.setdefault("histogram", [])
+    if len(histogram) < len(other["histogram"]):
+        histogram.extend([0] * (len(other["histogram"]) - len(histogram)))
+    for bucket, count in enumerate(other["histogram"]):
+        histogram[bucket] += count
+
+
+class JSONScoreStore:
+    """Keeps every score in a JSON snapshot plus an append-only journal
+
+    Each change is one line appended to <path>.journal. Once enough lines
+    pile up, a background thread folds them into a new snapshot, written
+    to a temp file and swapped in with os.replace so a crash never leaves
+    a half-written scores file. Journal lines carry a sequence number and
+    the snapshot records the last one it includes, so lines that were
+    already folded in are skipped on load.
+
+    Only each user's keep_top best and keep_recent latest scores per game
+    are kept; every score is also counted into daily and monthly rollups
+    under scores["rollups"][user][game][period].
+    """
+
+    def __init__(self, path, default_user="Player1", keep_top=None, keep_recent=None,
+                 compact_every=64):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.default_user = default_user
+        self.keep_top = keep_top
+        self.keep_recent = keep_recent
+        self.compact_every = compact_every
+
+        self.lock = threading.Lock()  # Guards self.scores and the journal
+        self.journal = None
+        self.compactor = None
+        self.tail = None  # Records journaled while a compaction is running
+        self.scores = self.load()
+
+    def load(self):
+        """Rebuild the scores from the snapshot and the journal"""
+        scores = None
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    scores = json.load(f)
+            except json.JSONDecodeError:
+                print("Error loading scores file, creating new one")
+
+        # Create default scores structure
+        if scores is None:
+            scores = {"users": {self.default_user: {"games": {}}}}
+
+        # Files from before rollups existed: count in the scores they still hold
+        if "rollups" not in scores:
+            scores["rollups"] = {}
+            for username, user_data in scores["users"].items():
+                for game_id, game_data in user_data.get("games", {}).items():
+                    for entry in game_data.get("scores", []):
+                        self.roll_up(scores, username, game_id, entry["score"],
+                                     entry.get("timestamp", 0))
+                    self.trim(game_data)
+
+        self.seq = scores.pop("journal_seq", 0)
+        self.pending = 0  # Journal lines not yet folded into the snapshot
+        records = [record for record in self.read_journal() if record["seq"] > self.seq]
+        self.apply(scores, records)
+        if records:
+            self.seq = records[-1]["seq"]
+            self.pending = len(records)
+        return scores
+
+    def read_journal(self):
+        """Read the journal's records, cutting off a line left incomplete by a crash"""
+        records = []
+        if not os.path.exists(self.journal_path):
+            return records
+
+        with open(self.journal_path, 'rb+') as f:
+            good = 0
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Later appends must not be glued onto the broken line
+                    print("Dropping incomplete line at the end of the scores journal")
+                    f.truncate(good)
+                    break
+                good += len(line)
+        return records
+
+    def apply(self, scores, records):
+        """Apply journal records to a scores structure"""
+        touched = set()
+        for record in records:
+            user = scores["users"].setdefault(record["user"], {"games": {}})
+            if record["op"] == "score":
+                game = user["games"].setdefault(record["game"], {"scores": []})
+                game["scores"].append({
+                    "score": record["score"],
+                    "level": record["level"],
+                    "timestamp": record["timestamp"]
+                })
+                self.roll_up(scores, record["user"], record["game"], record["score"],
+                             record["timestamp"])
+                touched.add((record["user"], record["game"]))
+
+        # Sort and trim each touched list once instead of after every insert
+        for username, game_id in touched:
+            self.trim(scores["users"][username]["games"][game_id])
+
+    @staticmethod
+    def roll_up(scores, username, game_id, score, timestamp):
+        """Count one score into its day and month rollups"""
+        rollups = scores["rollups"].setdefault(username, {}).setdefault(game_id, {})
+        for period, label in period_labels(timestamp).items():
+            add_to_rollup(rollups.setdefault(period, {}).setdefault(label, {}), score)
+
+    def trim(self, game_data):
+        """Sort a score list (highest first) and drop what retention doesn't keep"""
+        entries = game_data["scores"]
+        entries.sort(key=lambda x: x["score"], reverse=True)
+        if self.keep_top is None or self.keep_recent is None:
+            return
+        if len(entries) <= self.keep_top + self.keep_recent:
+            return
+
+        # The best keep_top plus the keep_recent latest
+        by_time = sorted(range(len(entries)), key=lambda i: entries[i].get("timestamp", 0))
+        keep = set(range(self.keep_top))
+        keep.update(by_time[len(by_time) - self.keep_recent:] if self.keep_recent else ())
+        game_data["scores"] = [entry for i, entry in enumerate(entries) if i in keep]
+
+    def append(self, records):
+        """Apply records and append them to the journal in one small write"""
+        with self.lock:
+            for record in records:
+                self.seq += 1
+                record["seq"] = self.seq
+            self.apply(self.scores, records)
+
+            try:
+                if self.journal is None:
+                    self.journal = open(self.journal_path, 'a')
+                self.journal.write("".join(json.dumps(record, separators=(",", ":")) + "\n"
+                                           for record in records))
+                self.journal.flush()
+                os.fsync(self.journal.fileno())
+            except Exception as e:
+                print(f"Error saving scores: {e}")
+
+            self.pending += len(records)
+            if self.tail is not None:
+                self.tail.extend(records)
+
+            # Fold the journal into the snapshot in the background once it grows
+            if self.pending >= self.compact_every and self.compactor is None:
+                self.compactor = threading.Thread(target=self.compact, name="score-compactor")
+                self.compactor.start()
+
+    def compact(self):
+        """Write a new snapshot atomically, then shrink the journal to what it lacks"""
+        with self.lock:
+            snapshot = json.dumps(dict(self.scores, journal_seq=self.seq), indent=2)
+            folded = self.pending
+            self.pending = 0
+            self.tail = []
+
+        try:
+            # Same temp file + rename dance as ArcadeHub.save_settings
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                f.write(snapshot)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+
+            # Keep only the records that arrived while the snapshot was written
+            with self.lock:
+                with open(temp_path, 'w') as f:
+                    f.writelines(json.dumps(record, separators=(",", ":")) + "\n"
+                                 for record in self.tail)
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self.journal is not None:
+                    self.journal.close()
+                    self.journal = None
+                os.replace(temp_path, self.journal_path)
+                self.tail = None
+                self.compactor = None
+        except Exception as e:
+            print(f"Error compacting scores: {e}")
+            with self.lock:
+                self.pending += folded
+                self.tail = None
+                self.compactor = None
+
+    def wait(self):
+        """Wait for a running compaction to finish"""
+        compactor = self.compactor
+        if compactor is not None:
+            compactor.join()
+
+    def reload(self):
+        """Re-read the file, picking up scores written by other processes"""
+        self.wait()
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            self.scores = self.load()
+
+    def add_user(self, username):
+        """Make sure a user exists"""
+        if username not in self.users():
+            self.append([{"op": "user", "user": username}])
+
+    def add_scores(self, entries):
+        """Add (username, game_id, score, level, timestamp) entries with one journal write"""
+        records = [{"op": "score", "user": username, "game": game_id, "score": score,
+                    "level": level, "timestamp": timestamp}
+                   for username, game_id, score, level, timestamp in entries]
+        if records:
+            self.append(records)
+
+    def get_high_score(self, username, game_id):
+        """Best score of one user in one game (0 if none)"""
+        with self.lock:
+            user_scores = self.scores["users"].get(username, {}).get("games", {}).get(game_id, {}).get("scores", [])
+            return user_scores[0]["score"] if user_scores else 0
+
+    def get_top_scores(self, game_id, limit=10):
+        """Best scores in a game across all users, highest first"""
+        all_scores = []
+
+        with self.lock:
+            for username, user_data in self.scores["users"].items():
+                if game_id in user_data.get("games", {}):
+                    for score_entry in user_data["games"][game_id].get("scores", []):
+                        all_scores.append({
+                            "username": username,
+                            "score": score_entry["score"],
+                            "level": score_entry.get("level", 1),
+                            "timestamp": score_entry.get("timestamp", 0)
+                        })
+
+        # Sort by score (highest first)
+        all_scores.sort(key=lambda x: x["score"], reverse=True)
+
+        return all_scores[:limit]
+
+    def iter_scores(self):
+        """Return every stored (username, game_id, score, level, timestamp)"""
+        with self.lock:
+            return [(username, game_id, entry["score"], entry.get("level", 1),
+                     entry.get("timestamp", 0))
+                    for username, user_data in self.scores["users"].items()
+                    for game_id, game_data in user_data.get("games", {}).items()
+                    for entry in game_data.get("scores", [])]
+
+    def users(self):
+        with self.lock:
+            return list(self.scores["users"])
+
+    def iter_rollups(self):
+        """Return every rollup as (username, game_id, period, label, rollup)"""
+        with self.lock:
+            return [(username, game_id, period, label, rollup)
+                    for username, games in self.scores["rollups"].items()
+                    for game_id, periods in games.items()
+                    for period, rollups in periods.items()
+                    for label, rollup in rollups.items()]
+
+    def get_rollups(self, game_id, period="day", username=None):
+        """Per-period stats for a game, for one user or (username=None) everyone
+
+        Returns {label: {"count", "sum", "max", "histogram"}}, e.g. label "2025-06-19".
+        """
+        stats = {}
+        with self.lock:
+            for name, games in self.scores["rollups"].items():
+                if username is not None and name != username:
+                    continue
+                for label, rollup in games.get(game_id, {}).get(period, {}).items():
+                    merge_rollup(stats.setdefault(label, {}), rollup)
+        return dict(sorted(stats.items()))
+
+    def close(self):
+        """Fold any remaining journal lines into the snapshot"""
+        self.wait()
+        if self.pending:
+            self.compact()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+class SQLiteScoreStore:
+    """Keeps scores in an indexed SQLite table, fast with millions of rows
+
+    Retention and rollups work as in JSONScoreStore; rollups live in
+    their own table, one row per (user, game, period, label).
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            name TEXT PRIMARY KEY
+        );
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            game_id TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            level INTEGER NOT NULL DEFAULT 1,
+            timestamp REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_game ON scores (game_id, score DESC);
+        CREATE INDEX IF NOT EXISTS scores_by_user ON scores (username, game_id, score DESC);
+        CREATE TABLE IF NOT EXISTS rollups (
+            username TEXT NOT NULL,
+            game_id TEXT NOT NULL,
+            period TEXT NOT NULL,
+            label TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            sum INTEGER NOT NULL,
+            max INTEGER NOT NULL,
+            histogram TEXT NOT NULL,
+            PRIMARY KEY (game_id, period, username, label)
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path, migrate_from=None, keep_top=None, keep_recent=None):
+        self.path = path
+        self.keep_top = keep_top
+        self.keep_recent = keep_recent
+
+        # Shared by the UI thread (reads) and the persistence thread (writes)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+
+        # WAL keeps inserts cheap and lets readers run alongside the writer
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+        # Import the old JSON scores the first time the database is opened
+        if migrate_from and os.path.exists(migrate_from) and not self.get_meta("migrated_from"):
+            self.migrate(JSONScoreStore(migrate_from))
+            self.set_meta("migrated_from", migrate_from)
+
+        # Databases from before rollups existed: count in the scores they hold
+        if not self.get_meta("rollups"):
+            with self.lock, self.conn:
+                self.roll_up(self.conn.execute(
+                    "SELECT username, game_id, score, level, timestamp FROM scores"))
+            self.set_meta("rollups", "1")
+
+        # Apply the retention limits to everything already stored, once: after the
+        # migration or when the limits change (add_scores trims as it goes)
+        retention = f"{keep_top},{keep_recent}"
+        if self.get_meta("retention") != retention:
+            with self.lock, self.conn:
+                self.trim(self.conn.execute("SELECT DISTINCT username, game_id FROM scores").fetchall())
+            self.set_meta("retention", retention)
+
+    def get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def migrate(self, source):
+        """Copy every user, score and rollup from a JSON store in one transaction"""
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO users (name) VALUES (?)",
+                                  [(username,) for username in source.users()])
+            self.conn.executemany(
+                "INSERT INTO scores (username, game_id, score, level, timestamp) VALUES (?, ?, ?, ?, ?)",
+                source.iter_scores())
+            self.conn.executemany(
+                "INSERT INTO rollups (username, game_id, period, label, count, sum, max, histogram) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(username, game_id, period, label, rollup["count"], rollup["sum"], rollup["max"],
+                  json.dumps(rollup["histogram"]))
+                 for username, game_id, period, label, rollup in source.iter_rollups()])
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rollups', '1')")
+        print(f"Migrated scores from {source.path} to {self.path}")
+
+    def reload(self):
+        """Nothing to do, every query already sees committed writes"""
+
+    def add_user(self, username):
+        """Make sure a user exists"""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO users (name) VALUES (?)", (username,))
+
+    def add_scores(self, entries):
+        """Add (username, game_id, score, level, timestamp) entries in one transaction"""
+        entries = list(entries)
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO users (name) VALUES (?)",
+                                  {(entry[0],) for entry in entries})
+            self.conn.executemany(
+                "INSERT INTO scores (username, game_id, score, level, timestamp) VALUES (?, ?, ?, ?, ?)",
+                entries)
+            self.roll_up(entries)
+            self.trim({(entry[0], entry[1]) for entry in entries})
+
+    def roll_up(self, entries):
+        """Count (username, game_id, score, level, timestamp) rows into their rollups
+
+        Must run inside a transaction holding self.lock.
+        """
+        deltas = {}
+        for username, game_id, score, level, timestamp in entries:
+            for period, label in period_labels(timestamp).items():
+                add_to_rollup(deltas.setdefault((username, game_id, period, label), {}), score)
+
+        for (username, game_id, period, label), delta in deltas.items():
+            row = self.conn.execute(
+                "SELECT count, sum, max, histogram FROM rollups "
+                "WHERE game_id = ? AND period = ? AND username = ? AND label = ?",
+                (game_id, period, username, label)).fetchone()
+            if row:
+                rollup = {"count": row[0], "sum": row[1], "max": row[2], "histogram": json.loads(row[3])}
+                merge_rollup(rollup, delta)
+            else:
+                rollup = delta
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rollups (username, game_id, period, label, count, sum, max, histogram) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (username, game_id, period, label, rollup["count"], rollup["sum"], rollup["max"],
+                 json.dumps(rollup["histogram"])))
+
+    def trim(self, pairs):
+        """Drop each (username, game_id)'s scores beyond its best keep_top and latest keep_recent
+
+        Must run inside a transaction holding self.lock.
+        """
+        if self.keep_top is None or self.keep_recent is None:
+            return
+        self.conn.executemany(
+            "DELETE FROM scores WHERE username = ?1 AND game_id = ?2 "
+            "AND id NOT IN (SELECT id FROM scores WHERE username = ?1 AND game_id = ?2 "
+            "               ORDER BY score DESC, id LIMIT ?3) "
+            "AND id NOT IN (SELECT id FROM scores WHERE username = ?1 AND game_id = ?2 "
+            "               ORDER BY timestamp DESC, id DESC LIMIT ?4)",
+            [(username, game_id, self.keep_top, self.keep_recent) for username, game_id in pairs])
+
+    def get_high_score(self, username, game_id):
+        """Best score of one user in one game (0 if none)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT MAX(score) FROM scores WHERE username = ? AND game_id = ?",
+                (username, game_id)).fetchone()
+        return row[0] or 0
+
+    def get_top_scores(self, game_id, limit=10):
+        """Best scores in a game across all users, highest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT username, score, level, timestamp FROM scores "
+                "WHERE game_id = ? ORDER BY score DESC LIMIT ?", (game_id, limit)).fetchall()
+        return [{"username": username, "score": score, "level": level, "timestamp": timestamp}
+                for username, score, level, timestamp in rows]
+
+    def iter_scores(self):
+        """Return every stored (username, game_id, score, level, timestamp)"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT username, game_id, score, level, timestamp FROM scores ORDER BY id").fetchall()
+
+    def users(self):
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT name FROM users")]
+
+    def get_rollups(self, game_id, period="day", username=None):
+        """Per-period stats for a game, for one user or (username=None) everyone
+
+        Returns {label: {"count", "sum", "max", "histogram"}}, e.g. label "2025-06-19".
+        """
+        query = ("SELECT label, count, sum, max, histogram FROM rollups "
+                 "WHERE game_id = ? AND period = ?")
+        params = [game_id, period]
+        if username is not None:
+            query += " AND username = ?"
+            params.append(username)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY label", params).fetchall()
+
+        stats = {}
+        for label, count, total, best, histogram in rows:
+            merge_rollup(stats.setdefault(label, {}), {
+                "count": count, "sum": total, "max": best, "histogram": json.loads(histogram)})
+        return stats
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def open_score_store(settings, profile_dir="config"):
+    """Open the score store picked by settings["storage"]["scores"] ("sqlite" or "json")
+
+    The SQLite store imports config/scores.json the first time it opens.
+    """
+    storage = settings.get("storage", {})
+    backend = storage.get("scores", "sqlite")
+    json_path = os.path.join(profile_dir, "scores.json")
+
+    # Per user and game, keep the best keep_top and latest keep_recent scores
+    # (null keeps everything). keep_top must cover the leaderboard's length.
+    retention = {
+        "keep_top": storage.get("keep_top", 10),
+        "keep_recent": storage.get("keep_recent", 20)
+    }
+
+    if backend == "sqlite":
+        return SQLiteScoreStore(os.path.join(profile_dir, "scores.db"), migrate_from=json_path,
+                                **retention)
+    if backend != "json":
+        print(f"Unknown score storage '{backend}', using JSON")
+    return JSONScoreStore(json_path, settings["player"]["name"], **retention)
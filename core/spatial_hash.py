@@ -0,0 +1,103 @@
+from itertools import count
+
+def boxes_overlap(x1, y1, w1, h1, x2, y2, w2, h2):
+    """True if two boxes overlap (touching edges don't count, like Rect.colliderect)"""
+    return x1 < x2 + w2 and x2 < x1 + w1 and y1 < y2 + h2 and y2 < y1 + h1
+
+
+class SpatialHash:
+    """Uniform grid of buckets for broad-phase collision queries
+
+    Each object is stored in every cell its bounding box touches, so a
+    query only has to look at the objects near the box it asks about
+    instead of every object in the game. Query results come back in
+    insertion order, so a game that takes the first hit gets the same
+    answer a scan over its object list would give.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}    # (cx, cy) -> {obj: insertion order}
+        self.objects = {}  # obj -> ((cx0, cy0, cx1, cy1), insertion order)
+        self.order = count()
+
+        # Counters for stress tests and benchmarks
+        self.queries = 0
+        self.candidates = 0  # Objects returned by queries, before exact tests
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __contains__(self, obj):
+        return obj in self.objects
+
+    def cell_range(self, x, y, width, height):
+        """The cells a box touches, as (cx0, cy0, cx1, cy1), edges included"""
+        size = self.cell_size
+        return (int(x // size), int(y // size),
+                int((x + width) // size), int((y + height) // size))
+
+    def insert(self, obj, x, y, width, height):
+        """Add an object with its bounding box"""
+        cells = self.cell_range(x, y, width, height)
+        order = next(self.order)
+        self.objects[obj] = (cells, order)
+        self._add(obj, cells, order)
+
+    def move(self, obj, x, y, width, height):
+        """Update an object's bounding box (cheap when it stays in the same cells)"""
+        cells = self.cell_range(x, y, width, height)
+        old_cells, order = self.objects[obj]
+        if cells != old_cells:
+            self._discard(obj, old_cells)
+            self._add(obj, cells, order)
+            self.objects[obj] = (cells, order)
+
+    def remove(self, obj):
+        """Remove an object, if it is present"""
+        entry = self.objects.pop(obj, None)
+        if entry:
+            self._discard(obj, entry[0])
+
+    def clear(self):
+        self.cells.clear()
+        self.objects.clear()
+
+    def query(self, x, y, width, height):
+        """Objects whose cells overlap a box, in insertion order
+
+        This is the broad phase: callers still test each candidate exactly.
+        """
+        cx0, cy0, cx1, cy1 = self.cell_range(x, y, width, height)
+        found = {}
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+
+        self.queries += 1
+        self.candidates += len(found)
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=found.__getitem__)
+
+    def _add(self, obj, cells, order):
+        cx0, cy0, cx1, cy1 = cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is None:
+                    bucket = self.cells[(cx, cy)] = {}
+                bucket[obj] = order
+
+    def _discard(self, obj, cells):
+        cx0, cy0, cx1, cy1 = cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+class TextCache:
+    """Size-aware LRU cache of rendered text surfaces"""
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, max_entries=1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+        # Counters for the debug overlay
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        """Estimate the memory used by a surface's pixel data"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get(self, key):
+        """Return the cached layers for a key, or None on a miss"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # Mark as most recently used
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, layers):
+        """Store a list of (surface, offset) layers under a key"""
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key)[1]
+
+        # Layers can share a surface (e.g. glow), only count each one once
+        unique = {id(surface): surface for surface, _ in layers}
+        size = sum(self.surface_bytes(surface) for surface in unique.values())
+
+        # Don't cache anything that would evict the whole cache on its own
+        if size > self.max_bytes:
+            return layers
+
+        self.entries[key] = (layers, size)
+        self.total_bytes += size
+
+        # Evict least recently used entries until we fit again
+        while self.entries and (self.total_bytes > self.max_bytes or
+                                len(self.entries) > self.max_entries):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+        return layers
+
+    def clear(self):
+        """Drop all cached surfaces (e.g. after fonts are reloaded)"""
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def hit_rate(self):
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,54 @@
+import bisect
+
+class TopScores:
+    """Per-game top-K score lists, kept up to date as scores are added"""
+
+    def __init__(self, k=10):
+        self.k = k
+        self.games = {}  # game_id -> up to k score entries, highest first
+        self.ranks = {}  # game_id -> the same entries' negated scores, ascending, for bisect
+
+        # Counters for the debug overlay
+        self.hits = 0
+        self.misses = 0   # Reads that had to query the score store
+        self.updates = 0
+
+    def get(self, game_id, limit):
+        """Return the top entries for a game, or None if they must be loaded"""
+        entries = self.games.get(game_id)
+        if entries is None or limit > self.k:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entries[:limit]
+
+    def fill(self, game_id, entries):
+        """Cache a game's top entries as loaded from the store (highest first)"""
+        self.games[game_id] = list(entries[:self.k])
+        self.ranks[game_id] = [-entry["score"] for entry in self.games[game_id]]
+
+    def add(self, game_id, entry):
+        """Insert a new score entry into a cached game's list"""
+        entries = self.games.get(game_id)
+        if entries is None:
+            return  # Loaded (including this entry) on the next read
+
+        # Equal scores rank in the order they were set
+        if len(entries) < self.k or entry["score"] > entries[-1]["score"]:
+            ranks = self.ranks[game_id]
+            index = bisect.bisect_right(ranks, -entry["score"])
+            entries.insert(index, entry)
+            ranks.insert(index, -entry["score"])
+            del entries[self.k:]
+            del ranks[self.k:]
+            self.updates += 1
+
+    def invalidate(self, game_id=None):
+        """Forget one game's list, or every list"""
+        if game_id is None:
+            self.games.clear()
+            self.ranks.clear()
+        else:
+            self.games.pop(game_id, None)
+            self.ranks.pop(game_id, None)
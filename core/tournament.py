@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import random
+import zlib
+import argparse
+import importlib
+import multiprocessing
+
+# Allow running as a script from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.headless import HeadlessGame
+from core.game_loader import GameLoader
+from core.user_profile import UserProfile
+
+# Every action name used by any game; HeadlessGame ignores the ones a game lacks
+ALL_ACTIONS = ["up", "down", "left", "right", "launch", "fire", "place"]
+
+
+def idle_agent(state):
+    """Agent that never presses anything (a baseline)"""
+    return []
+
+
+class RandomAgent:
+    """Agent that presses a random action some of the time"""
+
+    def __init__(self, press_chance=0.3, actions=None):
+        self.press_chance = press_chance
+        self.actions = actions or ALL_ACTIONS
+        self.rng = random.Random()
+
+    def seed(self, seed):
+        self.rng.seed(seed)
+
+    def __call__(self, state):
+        if self.rng.random() < self.press_chance:
+            return [self.rng.choice(self.actions)]
+        return []
+
+
+def episode_seed(base_seed, agent_name, game_id, episode):
+    """Stable seed for one episode, independent of which worker runs it"""
+    return zlib.crc32(f"{base_seed}:{agent_name}:{game_id}:{episode}".encode())
+
+
+# Per-process worker state, set up by _init_worker
+_worker = {}
+
+
+def _init_worker(agents, games_path):
+    _worker["agents"] = agents
+    _worker["games_path"] = games_path
+    _worker["envs"] = {}
+
+
+def _run_episode(task):
+    """Play one episode inside a worker process"""
+    agent_name, game_id, episode, seed, max_steps = task
+
+    # Each worker loads a game once and reuses it for every episode
+    env = _worker["envs"].get(game_id)
+    if env is None:
+        env = _worker["envs"][game_id] = HeadlessGame(game_id, _worker["games_path"])
+
+    # The game and (if it supports it) the agent get the episode's seed
+    agent = _worker["agents"][agent_name]
+    if hasattr(agent, "seed"):
+        agent.seed(seed)
+
+    start = time.perf_counter()
+    score, steps = env.run_episode(agent, max_steps, seed)
+    return {
+        "agent": agent_name,
+        "game_id": game_id,
+        "episode": episode,
+        "seed": seed,
+        "score": score,
+        "steps": steps,
+        "time": time.perf_counter() - start
+    }
+
+
+class Tournament:
+    """Runs bot players against games across a pool of worker processes"""
+
+    def __init__(self, agents, game_ids, episodes=10, processes=None, seed=0,
+                 max_steps=20000, games_path="games"):
+        self.agents = agents  # Name -> picklable agent callable
+        self.game_ids = list(game_ids)
+        self.episodes = episodes
+        self.processes = processes or os.cpu_count() or 1
+        self.seed = seed
+        self.max_steps = max_steps
+        self.games_path = games_path
+        self.results = []
+
+    def tasks(self):
+        """One task per (agent, game, episode)"""
+        return [(agent_name, game_id, episode,
+                 episode_seed(self.seed, agent_name, game_id, episode), self.max_steps)
+                for agent_name in self.agents
+                for game_id in self.game_ids
+                for episode in range(self.episodes)]
+
+    def run(self):
+        """Run every episode, yielding results as workers finish them"""
+        tasks = self.tasks()
+        self.results = []
+
+        # Several tasks per message keeps IPC overhead low without starving workers
+        chunksize = max(1, len(tasks) // (self.processes * 8))
+        with multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                  initargs=(self.agents, self.games_path)) as pool:
+            for result in pool.imap_unordered(_run_episode, tasks, chunksize):
+                self.results.append(result)
+                yield result
+
+    def summary(self):
+        """Aggregate results per (agent, game)"""
+        summary = {}
+        for result in self.results:
+            key = (result["agent"], result["game_id"])
+            stats = summary.setdefault(key, {"episodes": 0, "total": 0, "best": 0, "steps": 0})
+            stats["episodes"] += 1
+            stats["total"] += result["score"]
+            stats["best"] = max(stats["best"], result["score"])
+            stats["steps"] += result["steps"]
+
+        for stats in summary.values():
+            stats["mean"] = stats["total"] / stats["episodes"]
+        return summary
+
+    def record_scores(self, user_profile):
+        """Write each agent's best score per game in one bulk save"""
+        entries = [(agent_name, game_id, stats["best"], 1)
+                   for (agent_name, game_id), stats in self.summary().items()
+                   if stats["best"] > 0]
+        user_profile.add_scores(entries)
+        return len(entries)
+
+
+def load_agent(spec):
+    """Load an agent from a 'module:attribute' spec"""
+    module_name, _, attribute = spec.partition(":")
+    agent = getattr(importlib.import_module(module_name), attribute)
+    return agent() if isinstance(agent, type) else agent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless bot tournament")
+    parser.add_argument("--games", nargs="*", help="Game IDs (default: all discovered games)")
+    parser.add_argument("--agent", action="append", default=[], metavar="NAME=MODULE:ATTR",
+                        help="Agent to enter (default: the built-in idle and random agents)")
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-steps", type=int, default=20000)
+    parser.add_argument("--save", action="store_true", help="Record best scores in the configured score store (settings storage.scores)")
+    args = parser.parse_args()
+
+    if args.agent:
+        agents = {}
+        for entry in args.agent:
+            name, _, spec = entry.partition("=")
+            agents[name] = load_agent(spec)
+    else:
+        agents = {"IdleBot": idle_agent, "RandomBot": RandomAgent()}
+
+    game_ids = args.games or list(GameLoader().discover_games())
+    tournament = Tournament(agents, game_ids, args.episodes, args.processes,
+                            args.seed, args.max_steps)
+
+    start = time.perf_counter()
+    for result in tournament.run():
+        print(f"{result['agent']:>12} {result['game_id']:>15} #{result['episode']:<4} "
+              f"score={result['score']:<6} steps={result['steps']}")
+    elapsed = time.perf_counter() - start
+
+    print()
+    for (agent_name, game_id), stats in sorted(tournament.summary().items()):
+        print(f"{agent_name:>12} {game_id:>15} best={stats['best']:<6} mean={stats['mean']:.1f}")
+    total_steps = sum(result["steps"] for result in tournament.results)
+    print(f"{len(tournament.results)} episodes, {total_steps / elapsed:,.0f} steps/s "
+          f"on {tournament.processes} processes")
+
+    if args.save:
+        with open(os.path.join("config", "settings.json"), 'r') as f:
+            settings = json.load(f)
+        profile = UserProfile(settings)
+        try:
+            saved = tournament.record_scores(profile)
+        finally:
+            profile.close()  # Release the score store, even if recording failed
+        print(f"Recorded {saved} scores")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,127 @@
 import os
-import json
 import time
+import operator
+from core.score_store import open_score_store
+from core.top_scores import TopScores
 
 class UserProfile:
     """Manages user profiles and high scores"""
     
-    def __init__(self, settings):
+    def __init__(self, settings, persistence=None):
         self.settings = settings
         self.profile_dir = "config"
-        self.scores_file = os.path.join(self.profile_dir, "scores.json")
         self.current_user = settings["player"]["name"]
-        self.scores = self.load_scores()
         
-    def load_scores(self):
-        """Load scores from the scores file"""
-        if os.path.exists(self.scores_file):
-            try:
-                with open(self.scores_file, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print("Error loading scores file, creating new one")
+        # Scores live in a pluggable store (SQLite by default, see core/score_store.py)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.store = open_score_store(settings, self.profile_dir)
+        self.store.add_user(self.current_user)
         
-        # Create default scores structure
-        return {"users": {self.current_user: {"games": {}}}}
-    
-    def save_scores(self):
-        """Save scores to the scores file"""
-        try:
-            with open(self.scores_file, 'w') as f:
-                json.dump(self.scores, f, indent=2)
-        except Exception as e:
-            print(f"Error saving scores: {e}")
+        # Writes go through a background PersistenceWorker when given one
+        self.persistence = persistence
+        
+        # Memoized reads, kept in step with add_score so the render path never scans
+        self.top_scores = TopScores(k=10)
+        self.high_scores = {}  # (username, game_id) -> best score
     
     def add_score(self, game_id, score, level=1):
         """Add a new score for the current user"""
-        # Ensure user exists
-        if self.current_user not in self.scores["users"]:
-            self.scores["users"][self.current_user] = {"games": {}}
-            
-        # Ensure game exists for user
-        user_games = self.scores["users"][self.current_user]["games"]
-        if game_id not in user_games:
-            user_games[game_id] = {"scores": []}
-            
-        # Add the score with timestamp
-        score_entry = {
-            "score": score,
-            "level": level,
-            "timestamp": time.time()
-        }
-        
-        user_games[game_id]["scores"].append(score_entry)
-        
-        # Sort scores (highest first)
-        user_games[game_id]["scores"].sort(key=lambda x: x["score"], reverse=True)
-        
-        # Save scores
-        self.save_scores()
+        entries = [(self.current_user, game_id, score, level, time.time())]
+        self.write_scores(entries)
+    
+    def add_scores(self, entries):
+        """Add many scores at once and save a single time
         
+        entries is an iterable of (username, game_id, score, level) tuples.
+        """
+        now = time.time()
+        entries = [(username, game_id, score, level, now)
+                   for username, game_id, score, level in entries]
+        self.write_scores(entries)
+    
+    def write_scores(self, entries):
+        """Store (username, game_id, score, level, timestamp) entries and update the memos"""
+        if self.persistence:
+            # Queued score batches merge into one store write
+            self.persistence.submit("scores", self.store.add_scores, entries, operator.add)
+        else:
+            self.store.add_scores(entries)
+        self.remember_scores(entries)
+    
+    def flush(self):
+        """Wait for queued writes, so store reads see every added score"""
+        if self.persistence:
+            self.persistence.flush()
+    
+    def remember_scores(self, entries):
+        """Fold newly stored scores into the memoized top lists and high scores"""
+        for username, game_id, score, level, timestamp in entries:
+            self.top_scores.add(game_id, {
+                "username": username,
+                "score": score,
+                "level": level,
+                "timestamp": timestamp
+            })
+            
+            key = (username, game_id)
+            if key in self.high_scores:
+                self.high_scores[key] = max(self.high_scores[key], score)
+    
     def get_high_score(self, game_id):
         """Get the highest score for the current user and game"""
-        try:
-            user_scores = self.scores["users"][self.current_user]["games"].get(game_id, {}).get("scores", [])
-            if user_scores:
-                return user_scores[0]["score"]
-        except Exception:
-            pass
-            
-        return 0
+        key = (self.current_user, game_id)
+        if key not in self.high_scores:
+            self.flush()
+            try:
+                self.high_scores[key] = self.store.get_high_score(self.current_user, game_id)
+            except Exception:
+                return 0
         
+        return self.high_scores[key]
+    
     def get_global_high_scores(self, game_id, limit=10):
         """Get global high scores for a game across all users"""
-        all_scores = []
-        
-        for username, user_data in self.scores["users"].items():
-            if game_id in user_data.get("games", {}):
-                for score_entry in user_data["games"][game_id].get("scores", []):
-                    all_scores.append({
-                        "username": username,
-                        "score": score_entry["score"],
-                        "level": score_entry.get("level", 1),
-                        "timestamp": score_entry.get("timestamp", 0)
-                    })
+        high_scores = self.top_scores.get(game_id, limit)
+        if high_scores is None:
+            # Only the first read per game (or after a reload) hits the store
+            self.flush()
+            high_scores = self.store.get_top_scores(game_id, max(limit, self.top_scores.k))
+            self.top_scores.fill(game_id, high_scores)
+            high_scores = high_scores[:limit]
         
-        # Sort by score (highest first)
-        all_scores.sort(key=lambda x: x["score"], reverse=True)
-        
-        return all_scores[:limit]
+        return high_scores
+    
+    def get_score_stats(self, game_id, period="day", all_users=False):
+        """Daily or monthly stats for a game, for the current user or everyone
         
+        Returns {label: {"count", "sum", "max", "histogram"}} ordered by label
+        ("2025-06-19" for days, "2025-06" for months). These rollups cover every
+        score ever added, including the ones retention has since dropped.
+        """
+        self.flush()
+        return self.store.get_rollups(game_id, period, None if all_users else self.current_user)
+    
+    def reload(self):
+        """Re-read scores other processes may have written and drop memoized reads"""
+        self.flush()
+        self.store.reload()
+        self.top_scores.invalidate()
+        self.high_scores.clear()
+    
     def change_user(self, username):
         """Change the current user"""
         self.current_user = username
         self.settings["player"]["name"] = username
         
-        # Ensure user exists in scores
-        if username not in self.scores["users"]:
-            self.scores["users"][username] = {"games": {}}
-            self.save_scores()
+        # Ensure user exists in scores; their high scores load on first read
+        if self.persistence:
+            self.persistence.submit(("user", username), self.store.add_user, username)
+        else:
+            self.store.add_user(username)
         
-        return True
\ No newline at end of file
+        return True
+    
+    def close(self):
+        """Finish pending writes and release the score store"""
+        self.flush()
+        self.store.close()
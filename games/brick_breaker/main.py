@@ -2,6 +2,19 @@ import pygame
 import sys
 import random
 import os
+import math
+import time
+from operator import itemgetter
+from collections import defaultdict
+
+# Make the shared core package importable when this file is run directly
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from core.game_core import FixedTimestep, make_rng
+from core.replay import ReplayRecorder
+from core.asset_cache import assets
 
 # Game information dictionary
 GAME_INFO = {
@@ -11,6 +24,77 @@ GAME_INFO = {
     "version": "1.0"
 }
 
+def sweep_circle_box(x, y, dx, dy, radius, left, top, right, bottom):
+    """First contact of a circle moving by (dx, dy) with a box, as (t, nx, ny), or None
+    
+    t is the fraction of the move made before contact and (nx, ny) is the
+    unit normal of the surface hit. The circle's centre is cast as a ray
+    against the box grown by the radius, with rounded corners. A circle
+    that already overlaps the box hits it at t=0 if it is moving further in.
+    """
+    if dx == 0 and dy == 0:
+        return None
+    
+    # Already overlapping: the normal points out from the nearest surface
+    near_x = min(max(x, left), right)
+    near_y = min(max(y, top), bottom)
+    offset_x = x - near_x
+    offset_y = y - near_y
+    distance_sq = offset_x * offset_x + offset_y * offset_y
+    if distance_sq < radius * radius:
+        if distance_sq:
+            distance = math.sqrt(distance_sq)
+            nx, ny = offset_x / distance, offset_y / distance
+        else:
+            # Centre inside the box: leave by the shallowest side
+            nx, ny = min(((x - left, -1, 0), (right - x, 1, 0), (y - top, 0, -1), (bottom - y, 0, 1)),
+                         key=itemgetter(0))[1:]
+        return (0.0, nx, ny) if dx * nx + dy * ny < 0 else None
+    
+    # Slab test against the grown box
+    t_enter, t_exit = -math.inf, math.inf
+    hit_x = False  # Whether the ray enters through a left or right side
+    for start, delta, low, high, is_x in ((x, dx, left, right, True), (y, dy, top, bottom, False)):
+        low -= radius
+        high += radius
+        if delta == 0:
+            if not low <= start <= high:
+                return None
+            continue
+        t0 = ((low if delta > 0 else high) - start) / delta
+        t1 = ((high if delta > 0 else low) - start) / delta
+        if t0 > t_enter:
+            t_enter, hit_x = t0, is_x
+        t_exit = min(t_exit, t1)
+    if t_enter > t_exit or t_enter > 1 or t_exit <= 0:
+        return None
+    t_enter = max(t_enter, 0.0)
+    
+    # Entering next to a corner, the contact is with the corner's rounding (if any)
+    px = x + dx * t_enter
+    py = y + dy * t_enter
+    corner_x = left if px < left else right if px > right else None
+    corner_y = top if py < top else bottom if py > bottom else None
+    if corner_x is not None and corner_y is not None:
+        offset_x = x - corner_x
+        offset_y = y - corner_y
+        a = dx * dx + dy * dy
+        b = 2 * (dx * offset_x + dy * offset_y)
+        c = offset_x * offset_x + offset_y * offset_y - radius * radius
+        discriminant = b * b - 4 * a * c
+        if b >= 0 or discriminant < 0:
+            return None
+        t = (-b - math.sqrt(discriminant)) / (2 * a)
+        if t > 1:
+            return None
+        t = max(t, 0.0)
+        return t, (offset_x + dx * t) / radius, (offset_y + dy * t) / radius
+    
+    if hit_x:
+        return t_enter, -1 if dx > 0 else 1, 0
+    return t_enter, 0, -1 if dy > 0 else 1
+
+
 class Paddle:
     """Player-controlled paddle"""
     
@@ -46,8 +130,9 @@ class Paddle:
 class Ball:
     """Bouncing ball"""
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, rng=random):
         self.radius = 10
+        self.rng = rng
         self.color = (255, 255, 255)  # White
         self.speed_x = 5
         self.speed_y = -5
@@ -60,20 +145,89 @@ class Ball:
         
         # Ball is initially not moving
         self.moving = False
+        self.max_impacts = 8  # Bounces resolved per tick
     
-    def move(self):
-        """Move the ball if it's in motion"""
+    def move(self, paddle=None, bricks=None):
+        """Move the ball for one tick and return score earned
+        
+        The ball's path is swept against the walls, the paddle and the
+        bricks, so it bounces off everything it meets on the way however
+        far it travels in a tick, up to max_impacts times.
+        """
         if not self.moving:
-            return
+            return 0
+        
+        score = 0
+        remaining = 1.0  # Fraction of this tick's motion still to travel
+        for _ in range(self.max_impacts):
+            dx = self.speed_x * remaining
+            dy = self.speed_y * remaining
+            impact = self.first_impact(dx, dy, paddle, bricks)
+            if impact is None:
+                self.x += dx
+                self.y += dy
+                break
+            
+            # Travel up to the contact point, then bounce
+            t, nx, ny, target = impact
+            self.x += dx * t
+            self.y += dy * t
+            remaining *= 1 - t
             
-        self.x += self.speed_x
-        self.y += self.speed_y
+            if target is None:
+                self.reflect(nx, ny)  # Wall
+            elif target is paddle:
+                self.bounce_off_paddle(paddle)
+            else:
+                self.reflect(nx, ny)
+                bricks.remove(target.row, target.col)
+                score += target.points
+            
+            if remaining <= 0:
+                break
         
-        # Bounce off walls
-        if self.x <= self.radius or self.x >= self.screen_width - self.radius:
-            self.speed_x = -self.speed_x
-        if self.y <= self.radius:
-            self.speed_y = -self.speed_y
+        return score
+    
+    def first_impact(self, dx, dy, paddle, bricks):
+        """Earliest contact on a move by (dx, dy), as (t, nx, ny, target), or None
+        
+        target is the paddle, a brick, or None for a wall. Ties go to walls,
+        then the paddle, then bricks in row-major order.
+        """
+        radius = self.radius
+        impacts = []
+        
+        # Walls (the bottom is open)
+        if dx < 0 and self.x + dx <= radius:
+            impacts.append((max(0.0, (radius - self.x) / dx), 1, 0, None))
+        elif dx > 0 and self.x + dx >= self.screen_width - radius:
+            impacts.append((max(0.0, (self.screen_width - radius - self.x) / dx), -1, 0, None))
+        if dy < 0 and self.y + dy <= radius:
+            impacts.append((max(0.0, (radius - self.y) / dy), 0, 1, None))
+        
+        if paddle is not None:
+            hit = sweep_circle_box(self.x, self.y, dx, dy, radius, paddle.x, paddle.y,
+                                   paddle.x + paddle.width, paddle.y + paddle.height)
+            if hit:
+                impacts.append(hit + (paddle,))
+        
+        if bricks is not None:
+            # Only the bricks under the swept path can be hit
+            for brick in bricks.query(min(self.x, self.x + dx) - radius, min(self.y, self.y + dy) - radius,
+                                      abs(dx) + radius * 2, abs(dy) + radius * 2):
+                hit = sweep_circle_box(self.x, self.y, dx, dy, radius, brick.x, brick.y,
+                                       brick.x + brick.width, brick.y + brick.height)
+                if hit:
+                    impacts.append(hit + (brick,))
+        
+        return min(impacts, key=itemgetter(0), default=None)
+    
+    def reflect(self, nx, ny):
+        """Bounce off a surface with unit normal (nx, ny)"""
+        along = self.speed_x * nx + self.speed_y * ny
+        if along < 0:
+            self.speed_x -= 2 * along * nx
+            self.speed_y -= 2 * along * ny
     
     def draw(self, screen):
         """Draw the ball on the screen"""
@@ -84,7 +238,7 @@ class Ball:
         self.x = paddle.x + paddle.width // 2
         self.y = paddle.y - self.radius
         self.moving = False
-        self.speed_x = random.choice([-5, 5])
+        self.speed_x = self.rng.choice([-5, 5])
         self.speed_y = -5
     
     def launch(self):
@@ -92,57 +246,12 @@ class Ball:
         if not self.moving:
             self.moving = True
     
-    def check_paddle_collision(self, paddle):
-        """Check for collision with the paddle"""
-        paddle_rect = paddle.get_rect()
-        
-        if (self.y + self.radius >= paddle_rect.top and 
-            self.y - self.radius <= paddle_rect.bottom and
-            self.x + self.radius >= paddle_rect.left and
-            self.x - self.radius <= paddle_rect.right):
-            
-            # Calculate bounce angle based on where the ball hit the paddle
-            relative_x = (self.x - (paddle_rect.left + paddle_rect.width / 2)) / (paddle_rect.width / 2)
-            self.speed_x = relative_x * 7  # Adjust horizontal speed based on hit position
-            self.speed_y = -abs(self.speed_y)  # Always bounce up
-            return True
-            
-        return False
-    
-    def check_brick_collision(self, bricks):
-        """Check for collision with bricks and return score earned"""
-        score = 0
-        
-        for brick in bricks[:]:
-            brick_rect = brick.get_rect()
-            
-            if (self.y + self.radius >= brick_rect.top and 
-                self.y - self.radius <= brick_rect.bottom and
-                self.x + self.radius >= brick_rect.left and
-                self.x - self.radius <= brick_rect.right):
-                
-                # Determine which side of the brick was hit
-                # Calculate distances to each edge
-                dist_left = abs(self.x - brick_rect.left)
-                dist_right = abs(self.x - brick_rect.right)
-                dist_top = abs(self.y - brick_rect.top)
-                dist_bottom = abs(self.y - brick_rect.bottom)
-                
-                # Find the minimum distance
-                min_dist = min(dist_left, dist_right, dist_top, dist_bottom)
-                
-                # Bounce based on which side was hit
-                if min_dist == dist_left or min_dist == dist_right:
-                    self.speed_x = -self.speed_x
-                else:
-                    self.speed_y = -self.speed_y
-                
-                # Remove the brick and add score
-                bricks.remove(brick)
-                score += brick.points
-                break
-                
-        return score
+    def bounce_off_paddle(self, paddle):
+        """Send the ball back up, angled by where it met the paddle"""
+        # Calculate bounce angle based on where the ball hit the paddle
+        relative_x = (self.x - (paddle.x + paddle.width / 2)) / (paddle.width / 2)
+        self.speed_x = relative_x * 7  # Adjust horizontal speed based on hit position
+        self.speed_y = -abs(self.speed_y)  # Always bounce up
     
     def is_out_of_bounds(self):
         """Check if the ball is below the bottom of the screen"""
@@ -159,6 +268,8 @@ class Brick:
         self.height = height
         self.color = color
         self.points = points
+        self.row = None  # Cell in the level's BrickGrid, set when placed
+        self.col = None
     
     def draw(self, screen):
         """Draw the brick on the screen"""
@@ -171,10 +282,98 @@ class Brick:
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
 
+class BrickGrid:
+    """The bricks of a level, stored by (row, col) on its regular layout
+    
+    Every brick sits at a fixed pitch from the top-left corner, so the
+    cells a box touches come from a little arithmetic and only those cells
+    are looked at, however many rows and columns the level has. Removing
+    a brick just empties its cell. Iterating gives the bricks left in
+    row-major order, the order they were created in.
+    """
+    
+    def __init__(self, rows, cols, brick_width, brick_height, margin, top):
+        self.rows = rows
+        self.cols = cols
+        self.brick_width = brick_width
+        self.brick_height = brick_height
+        self.left = margin
+        self.top = top
+        self.pitch_x = brick_width + margin
+        self.pitch_y = brick_height + margin
+        self.cells = [[None] * cols for _ in range(rows)]
+        self.count = 0
+        self.removed = []  # Bricks removed since the renderer last erased them
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        for row in self.cells:
+            for brick in row:
+                if brick is not None:
+                    yield brick
+    
+    def position(self, row, col):
+        """Top-left corner of a cell"""
+        return col * self.pitch_x + self.left, row * self.pitch_y + self.top
+    
+    def place(self, row, col, brick):
+        """Put a brick in a cell, replacing any brick already there"""
+        if self.cells[row][col] is None:
+            self.count += 1
+        self.cells[row][col] = brick
+        brick.row = row
+        brick.col = col
+    
+    def remove(self, row, col):
+        """Empty a cell and return the brick that was in it (or None)"""
+        brick = self.cells[row][col]
+        if brick is not None:
+            self.cells[row][col] = None
+            self.count -= 1
+            self.removed.append(brick)
+        return brick
+    
+    def cell_range(self, x, y, width, height):
+        """Rows and columns whose bricks a box touches, as (row0, col0, row1, col1)
+        
+        Edges count as touching. The range is empty (row0 > row1 or
+        col0 > col1) when the box misses the grid.
+        """
+        # First cell whose far edge reaches the box, last cell whose near edge does
+        col0 = max(0, -int((self.left + self.brick_width - x) // self.pitch_x))
+        col1 = min(self.cols - 1, int((x + width - self.left) // self.pitch_x))
+        row0 = max(0, -int((self.top + self.brick_height - y) // self.pitch_y))
+        row1 = min(self.rows - 1, int((y + height - self.top) // self.pitch_y))
+        return row0, col0, row1, col1
+    
+    def query(self, x, y, width, height):
+        """Bricks in the cells a box touches, in row-major order"""
+        row0, col0, row1, col1 = self.cell_range(x, y, width, height)
+        found = []
+        for row in range(row0, row1 + 1):
+            cells = self.cells[row]
+            for col in range(col0, col1 + 1):
+                if cells[col] is not None:
+                    found.append(cells[col])
+        return found
+
+
 class Game:
     """Brick Breaker game implementation"""
     
-    def __init__(self):
+    # Bump when a change makes the same inputs play out differently, so older replays are rejected
+    SIM_VERSION = 2  # 2: swept ball collisions
+    
+    # Keys that drive the simulation, by action name (see step)
+    ACTIONS = {
+        "left": pygame.K_LEFT,
+        "right": pygame.K_RIGHT,
+        "launch": pygame.K_SPACE
+    }
+    
+    def __init__(self, headless=False, seed=None):
         self.width = 800
         self.height = 600
         self.bg_color = (0, 0, 30)  # Dark blue
@@ -184,6 +383,37 @@ class Game:
         self.game_over = False
         self.paused = False
         
+        # Simulation runs at a fixed tick rate
+        self.tick_rate = 60
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.rng, self.seed = make_rng(seed)
+        self.recorder = None  # Inputs of the last interactive session
+        
+        # Headless games skip the window, fonts and sounds entirely
+        self.headless = headless
+        self.sounds = {}
+        self.clock = None
+        if not headless:
+            self.init_display()
+        
+        # Initialize game objects
+        self.paddle = Paddle(self.width, self.height)
+        self.ball = Ball(self.width, self.height, self.rng)
+        self.bricks = None  # BrickGrid, built by create_level
+        
+        # Bricks are drawn once per level into an off-screen layer (see draw_bricks)
+        self.brick_layer = None
+        self.layer_builds = 0
+        
+        # Milliseconds spent drawing each layer in the last frame, shown with F3
+        self.draw_times = {"bricks": 0.0, "sprites": 0.0, "hud": 0.0}
+        self.show_timings = False
+        
+        # Create bricks for the first level
+        self.create_level(self.level)
+    
+    def init_display(self):
+        """Set up the window, fonts and sounds for interactive play"""
         # Initialize pygame if not already done
         if not pygame.get_init():
             pygame.init()
@@ -192,34 +422,13 @@ class Game:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption(GAME_INFO["title"])
         
-        # Load fonts
-        self.font_dir = os.path.join("assets", "fonts")
-        try:
-            self.font_large = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 36)
-            self.font_medium = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 24)
-            self.font_small = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 18)
-        except FileNotFoundError:
-            self.font_large = pygame.font.SysFont("Arial", 36, bold=True)
-            self.font_medium = pygame.font.SysFont("Arial", 24, bold=True)
-            self.font_small = pygame.font.SysFont("Arial", 18)
+        # Fonts and sounds come from the shared cache, pre-loaded by the hub
+        self.load_assets()
         
-        # Load sounds
-        self.sound_dir = os.path.join("games", "brick_breaker", "assets", "sounds")
-        self.sounds = {}
-        
-        # Initialize game objects
-        self.paddle = Paddle(self.width, self.height)
-        self.ball = Ball(self.width, self.height)
-        self.bricks = []
         self.clock = pygame.time.Clock()
-        
-        # Create bricks for the first level
-        self.create_level(self.level)
     
     def create_level(self, level):
         """Create bricks for the current level"""
-        self.bricks = []
-        
         # Brick properties
         brick_width = 75
         brick_height = 30
@@ -243,17 +452,35 @@ class Game:
         ]
         
         # Create the bricks
+        self.brick_layer = None  # Redrawn on the next frame
+        self.bricks = BrickGrid(rows, cols, brick_width, brick_height, brick_margin, top_margin)
         for row in range(rows):
             for col in range(cols):
-                x = col * (brick_width + brick_margin) + brick_margin
-                y = row * (brick_height + brick_margin) + top_margin
+                x, y = self.bricks.position(row, col)
                 color = colors[row % len(colors)]
                 points = row + 1  # Points based on row
                 
-                self.bricks.append(Brick(x, y, brick_width, brick_height, color, points))
+                self.bricks.place(row, col, Brick(x, y, brick_width, brick_height, color, points))
     
-    def start(self):
-        """Start the game and return the final score"""
+    def load_assets(self):
+        """Load fonts and sounds (cached, so only the first load touches the disk)"""
+        # Load fonts
+        self.font_dir = os.path.join("assets", "fonts")
+        font_path = os.path.join(self.font_dir, "arcade.ttf")
+        self.font_large = assets.font(font_path, 36, "Arial", bold=True)
+        self.font_medium = assets.font(font_path, 24, "Arial", bold=True)
+        self.font_small = assets.font(font_path, 18, "Arial")
+        
+        # Load sounds
+        self.sound_dir = os.path.join("games", "brick_breaker", "assets", "sounds")
+    
+    def reset(self, seed=None):
+        """Reset the game to its initial state and return that state
+        
+        Every reset draws a new seed unless one is given, see self.seed.
+        """
+        self.rng, self.seed = make_rng(seed)
+        
         # Reset game state
         self.score = 0
         self.lives = 3
@@ -266,9 +493,50 @@ class Game:
         
         # Reset paddle and ball
         self.paddle = Paddle(self.width, self.height)
-        self.ball = Ball(self.width, self.height)
+        self.ball = Ball(self.width, self.height, self.rng)
         self.ball.reset(self.paddle)
         
+        return self.get_state()
+    
+    def get_state(self):
+        """Snapshot of the simulation state for headless players"""
+        return {
+            "score": self.score,
+            "lives": self.lives,
+            "level": self.level,
+            "game_over": self.game_over,
+            "paddle": (self.paddle.x, self.paddle.y, self.paddle.width),
+            "ball": (self.ball.x, self.ball.y, self.ball.speed_x, self.ball.speed_y),
+            "ball_moving": self.ball.moving,
+            "bricks": [(brick.x, brick.y, brick.width, brick.height) for brick in self.bricks]
+        }
+    
+    def handle_key(self, key):
+        """Handle a gameplay key press"""
+        if key == pygame.K_SPACE:
+            self.ball.launch()
+    
+    def step(self, actions=()):
+        """Advance one tick with the given keys pressed, returns (state, reward, done)"""
+        actions = list(actions)
+        previous_score = self.score
+        if not self.game_over:
+            for key in actions:
+                self.handle_key(key)
+            self.update(defaultdict(bool, dict.fromkeys(actions, True)))
+        return self.get_state(), self.score - previous_score, self.game_over
+    
+    def start(self):
+        """Start the game and return the final score"""
+        self.reset()
+        
+        # Record every input the simulation reads so the session can be replayed
+        self.recorder = ReplayRecorder(self.seed, self.tick_rate, self.SIM_VERSION)
+        
+        # Don't count the time spent before the first frame
+        self.clock.tick()
+        self.timestep.reset()
+        
         # Main game loop
         running = True
         while running:
@@ -281,27 +549,33 @@ class Game:
                         return self.score
                     elif event.key == pygame.K_p:
                         self.paused = not self.paused
-                    elif event.key == pygame.K_SPACE:
-                        self.ball.launch()
+                    elif event.key == pygame.K_F3:
+                        self.show_timings = not self.show_timings
                     elif event.key == pygame.K_r and self.game_over:
                         return self.start()  # Restart game
+                    else:
+                        self.recorder.key_down(event.key)
+                        self.handle_key(event.key)
+            
+            # Run the simulation in fixed ticks, independent of the frame rate
+            ticks = self.timestep.advance(self.clock.tick(60))
             
             # Update game state if not paused or game over
-            if not self.paused and not self.game_over:
-                self.update()
+            for _ in range(ticks):
+                if self.paused or self.game_over:
+                    break
+                self.update(self.recorder.tick(pygame.key.get_pressed()))
             
             # Render game
             self.render()
-            
-            # Cap the frame rate
-            self.clock.tick(60)
         
         return self.score
     
-    def update(self):
+    def update(self, keys=None):
         """Update game state"""
         # Get keyboard state
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Move paddle
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -313,15 +587,8 @@ class Game:
         if not self.ball.moving:
             self.ball.reset(self.paddle)
         else:
-            # Move ball
-            self.ball.move()
-            
-            # Check for paddle collision
-            self.ball.check_paddle_collision(self.paddle)
-            
-            # Check for brick collision
-            score = self.ball.check_brick_collision(self.bricks)
-            self.score += score
+            # Move ball, bouncing off the walls, paddle and bricks on the way
+            self.score += self.ball.move(self.paddle, self.bricks)
             
             # Check if all bricks are cleared
             if not self.bricks:
@@ -337,20 +604,43 @@ class Game:
                 else:
                     self.ball.reset(self.paddle)
     
+    def draw_bricks(self):
+        """Blit the brick layer over the whole screen, erasing bricks broken since last frame
+        
+        The layer (background included) is rendered once per level, so a
+        frame costs one blit however many bricks there are.
+        """
+        if self.brick_layer is None:
+            self.brick_layer = pygame.Surface((self.width, self.height)).convert()
+            self.brick_layer.fill(self.bg_color)
+            for brick in self.bricks:
+                brick.draw(self.brick_layer)
+            self.bricks.removed.clear()
+            self.layer_builds += 1
+        
+        for brick in self.bricks.removed:
+            self.brick_layer.fill(self.bg_color, (brick.x, brick.y, brick.width, brick.height))
+        self.bricks.removed.clear()
+        
+        self.screen.blit(self.brick_layer, (0, 0))
+    
     def render(self):
         """Render the game"""
-        # Clear screen
-        self.screen.fill(self.bg_color)
-        
-        # Draw bricks
-        for brick in self.bricks:
-            brick.draw(self.screen)
+        # Draw bricks (this also clears the screen)
+        start = time.perf_counter()
+        self.draw_bricks()
+        now = time.perf_counter()
+        self.draw_times["bricks"] = (now - start) * 1000
+        start = now
         
         # Draw paddle
         self.paddle.draw(self.screen)
         
         # Draw ball
         self.ball.draw(self.screen)
+        now = time.perf_counter()
+        self.draw_times["sprites"] = (now - start) * 1000
+        start = now
         
         # Draw score
         score_text = self.font_medium.render(f"Score: {self.score}", True, (255, 255, 255))
@@ -389,6 +679,13 @@ class Game:
             self.screen.blit(launch_text, 
                             (self.width // 2 - launch_text.get_width() // 2, 
                              self.height - 100))
+        self.draw_times["hud"] = (time.perf_counter() - start) * 1000
+        
+        # Draw layer timings
+        if self.show_timings:
+            timings = " | ".join(f"{layer} {ms:.2f} ms" for layer, ms in self.draw_times.items())
+            timing_text = self.font_small.render(timings, True, (0, 255, 0))
+            self.screen.blit(timing_text, (10, self.height - timing_text.get_height() - 5))
         
         # Update display
         pygame.display.flip()
@@ -2,6 +2,17 @@ import pygame
 import sys
 import random
 import os
+from collections import defaultdict
+
+# Make the shared core package importable when this file is run directly
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from core.game_core import FixedTimestep, make_rng
+from core.replay import ReplayRecorder
+from core.asset_cache import assets
+from core.spatial_hash import SpatialHash, boxes_overlap
 
 # Game information dictionary
 GAME_INFO = {
@@ -56,18 +67,19 @@ class Player:
 class Coin:
     """Collectible coin"""
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, rng=random):
         self.radius = 10
         self.color = (255, 215, 0)  # Gold
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.rng = rng
         self.spawn()
     
     def spawn(self):
         """Spawn the coin at a random position"""
         margin = self.radius * 2
-        self.x = random.randint(margin, self.screen_width - margin)
-        self.y = random.randint(margin, self.screen_height - margin)
+        self.x = self.rng.randint(margin, self.screen_width - margin)
+        self.y = self.rng.randint(margin, self.screen_height - margin)
     
     def draw(self, screen):
         """Draw the coin on the screen"""
@@ -86,35 +98,35 @@ class Coin:
 class Obstacle:
     """Moving obstacle"""
     
-    def __init__(self, screen_width, screen_height):
-        self.width = random.randint(20, 40)
-        self.height = random.randint(20, 40)
+    def __init__(self, screen_width, screen_height, rng=random):
+        self.width = rng.randint(20, 40)
+        self.height = rng.randint(20, 40)
         self.color = (255, 0, 0)  # Red
         self.screen_width = screen_width
         self.screen_height = screen_height
         
         # Random position at the edge of the screen
-        edge = random.choice(["top", "right", "bottom", "left"])
+        edge = rng.choice(["top", "right", "bottom", "left"])
         if edge == "top":
-            self.x = random.randint(0, screen_width - self.width)
+            self.x = rng.randint(0, screen_width - self.width)
             self.y = -self.height
-            self.dx = random.choice([-1, 0, 1])
-            self.dy = random.randint(1, 3)
+            self.dx = rng.choice([-1, 0, 1])
+            self.dy = rng.randint(1, 3)
         elif edge == "right":
             self.x = screen_width
-            self.y = random.randint(0, screen_height - self.height)
-            self.dx = random.randint(-3, -1)
-            self.dy = random.choice([-1, 0, 1])
+            self.y = rng.randint(0, screen_height - self.height)
+            self.dx = rng.randint(-3, -1)
+            self.dy = rng.choice([-1, 0, 1])
         elif edge == "bottom":
-            self.x = random.randint(0, screen_width - self.width)
+            self.x = rng.randint(0, screen_width - self.width)
             self.y = screen_height
-            self.dx = random.choice([-1, 0, 1])
-            self.dy = random.randint(-3, -1)
+            self.dx = rng.choice([-1, 0, 1])
+            self.dy = rng.randint(-3, -1)
         else:  # left
             self.x = -self.width
-            self.y = random.randint(0, screen_height - self.height)
-            self.dx = random.randint(1, 3)
-            self.dy = random.choice([-1, 0, 1])
+            self.y = rng.randint(0, screen_height - self.height)
+            self.dx = rng.randint(1, 3)
+            self.dy = rng.choice([-1, 0, 1])
     
     def move(self):
         """Move the obstacle"""
@@ -158,7 +170,15 @@ class Obstacle:
 class Game:
     """Coin Dash game implementation"""
     
-    def __init__(self):
+    # Keys that drive the simulation, by action name (see step)
+    ACTIONS = {
+        "up": pygame.K_UP,
+        "down": pygame.K_DOWN,
+        "left": pygame.K_LEFT,
+        "right": pygame.K_RIGHT
+    }
+    
+    def __init__(self, headless=False, seed=None):
         self.width = 800
         self.height = 600
         self.bg_color = (100, 100, 200)  # Light blue
@@ -167,38 +187,31 @@ class Game:
         self.game_over = False
         self.paused = False
         
-        # Initialize pygame if not already done
-        if not pygame.get_init():
-            pygame.init()
-            
-        # Set up display
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption(GAME_INFO["title"])
+        # Simulation runs at a fixed tick rate
+        self.tick_rate = 60
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.rng, self.seed = make_rng(seed)
+        self.recorder = None  # Inputs of the last interactive session
         
-        # Load fonts
-        self.font_dir = os.path.join("assets", "fonts")
-        try:
-            self.font_large = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 36)
-            self.font_medium = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 24)
-            self.font_small = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 18)
-        except FileNotFoundError:
-            self.font_large = pygame.font.SysFont("Arial", 36, bold=True)
-            self.font_medium = pygame.font.SysFont("Arial", 24, bold=True)
-            self.font_small = pygame.font.SysFont("Arial", 18)
-        
-        # Load sounds
-        self.sound_dir = os.path.join("games", "coin_dash", "assets", "sounds")
+        # Headless games skip the window, fonts and sounds entirely
+        self.headless = headless
         self.sounds = {}
+        self.clock = None
+        if not headless:
+            self.init_display()
         
         # Initialize game objects
         self.player = Player(self.width, self.height)
         self.coins = []
         self.obstacles = []
-        self.clock = pygame.time.Clock()
+        
+        # Broad phase for player collisions, kept in step with the lists above
+        self.coin_hash = SpatialHash(cell_size=64)
+        self.obstacle_hash = SpatialHash(cell_size=64)
         
         # Create initial coins
         for _ in range(5):
-            self.coins.append(Coin(self.width, self.height))
+            self.add_coin()
         
         # Timer for obstacle spawning
         self.obstacle_timer = 0
@@ -207,8 +220,40 @@ class Game:
         # Timer for game countdown
         self.timer = 0
     
-    def start(self):
-        """Start the game and return the final score"""
+    def init_display(self):
+        """Set up the window, fonts and sounds for interactive play"""
+        # Initialize pygame if not already done
+        if not pygame.get_init():
+            pygame.init()
+            
+        # Set up display
+        self.screen = pygame.display.set_mode((self.width, self.height))
+        pygame.display.set_caption(GAME_INFO["title"])
+        
+        # Fonts and sounds come from the shared cache, pre-loaded by the hub
+        self.load_assets()
+        
+        self.clock = pygame.time.Clock()
+    
+    def load_assets(self):
+        """Load fonts and sounds (cached, so only the first load touches the disk)"""
+        # Load fonts
+        self.font_dir = os.path.join("assets", "fonts")
+        font_path = os.path.join(self.font_dir, "arcade.ttf")
+        self.font_large = assets.font(font_path, 36, "Arial", bold=True)
+        self.font_medium = assets.font(font_path, 24, "Arial", bold=True)
+        self.font_small = assets.font(font_path, 18, "Arial")
+        
+        # Load sounds
+        self.sound_dir = os.path.join("games", "coin_dash", "assets", "sounds")
+    
+    def reset(self, seed=None):
+        """Reset the game to its initial state and return that state
+        
+        Every reset draws a new seed unless one is given, see self.seed.
+        """
+        self.rng, self.seed = make_rng(seed)
+        
         # Reset game state
         self.score = 0
         self.time_left = 30
@@ -219,15 +264,70 @@ class Game:
         self.player = Player(self.width, self.height)
         self.coins = []
         self.obstacles = []
+        self.coin_hash.clear()
+        self.obstacle_hash.clear()
         
         # Create initial coins
         for _ in range(5):
-            self.coins.append(Coin(self.width, self.height))
+            self.add_coin()
         
         # Reset timers
         self.obstacle_timer = 0
+        self.obstacle_spawn_time = 60
         self.timer = 0
         
+        return self.get_state()
+    
+    def add_coin(self):
+        """Spawn a coin at a random position"""
+        coin = Coin(self.width, self.height, self.rng)
+        self.coins.append(coin)
+        self.coin_hash.insert(coin, coin.x - coin.radius, coin.y - coin.radius,
+                              coin.radius * 2, coin.radius * 2)
+    
+    def add_obstacle(self):
+        """Spawn an obstacle at a random edge of the screen"""
+        obstacle = Obstacle(self.width, self.height, self.rng)
+        self.obstacles.append(obstacle)
+        self.obstacle_hash.insert(obstacle, obstacle.x, obstacle.y, obstacle.width, obstacle.height)
+    
+    def get_state(self):
+        """Snapshot of the simulation state for headless players"""
+        return {
+            "score": self.score,
+            "time_left": self.time_left,
+            "game_over": self.game_over,
+            "player": (self.player.x, self.player.y, self.player.width, self.player.height),
+            "coins": [(coin.x, coin.y) for coin in self.coins],
+            "obstacles": [(obstacle.x, obstacle.y, obstacle.width, obstacle.height, 
+                           obstacle.dx, obstacle.dy) for obstacle in self.obstacles]
+        }
+    
+    def handle_key(self, key):
+        """Handle a gameplay key press"""
+        pass  # Movement only uses held keys
+    
+    def step(self, actions=()):
+        """Advance one tick with the given keys pressed, returns (state, reward, done)"""
+        actions = list(actions)
+        previous_score = self.score
+        if not self.game_over:
+            for key in actions:
+                self.handle_key(key)
+            self.update(defaultdict(bool, dict.fromkeys(actions, True)))
+        return self.get_state(), self.score - previous_score, self.game_over
+    
+    def start(self):
+        """Start the game and return the final score"""
+        self.reset()
+        
+        # Record every input the simulation reads so the session can be replayed
+        self.recorder = ReplayRecorder(self.seed, self.tick_rate)
+        
+        # Don't count the time spent before the first frame
+        self.clock.tick()
+        self.timestep.reset()
+        
         # Main game loop
         running = True
         while running:
@@ -242,23 +342,29 @@ class Game:
                         self.paused = not self.paused
                     elif event.key == pygame.K_r and self.game_over:
                         return self.start()  # Restart game
+                    elif not self.paused and not self.game_over:
+                        self.recorder.key_down(event.key)
+                        self.handle_key(event.key)
+            
+            # Run the simulation in fixed ticks, independent of the frame rate
+            ticks = self.timestep.advance(self.clock.tick(60))
             
             # Update game state if not paused or game over
-            if not self.paused and not self.game_over:
-                self.update()
+            for _ in range(ticks):
+                if self.paused or self.game_over:
+                    break
+                self.update(self.recorder.tick(pygame.key.get_pressed()))
             
             # Render game
             self.render()
-            
-            # Cap the frame rate
-            self.clock.tick(60)
         
         return self.score
     
-    def update(self):
+    def update(self, keys=None):
         """Update game state"""
         # Get keyboard state
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Calculate movement
         dx = 0
@@ -275,16 +381,18 @@ class Game:
         # Move player
         self.player.move(dx, dy)
         
-        # Check for coin collisions
-        player_rect = self.player.get_rect()
-        for coin in self.coins[:]:
-            if player_rect.colliderect(coin.get_rect()):
+        # Check for collisions with the coins near the player
+        player = self.player
+        for coin in self.coin_hash.query(player.x, player.y, player.width, player.height):
+            if boxes_overlap(player.x, player.y, player.width, player.height,
+                             coin.x - coin.radius, coin.y - coin.radius, coin.radius * 2, coin.radius * 2):
                 self.coins.remove(coin)
+                self.coin_hash.remove(coin)
                 self.score += 1
                 self.time_left += 1  # Add time for each coin
                 
                 # Spawn a new coin
-                self.coins.append(Coin(self.width, self.height))
+                self.add_coin()
         
         # Move obstacles
         for obstacle in self.obstacles[:]:
@@ -293,15 +401,21 @@ class Game:
             # Remove obstacles that are off screen
             if obstacle.is_off_screen():
                 self.obstacles.remove(obstacle)
-            
-            # Check for collision with player
-            elif player_rect.colliderect(obstacle.get_rect()):
+                self.obstacle_hash.remove(obstacle)
+            else:
+                self.obstacle_hash.move(obstacle, obstacle.x, obstacle.y, obstacle.width, obstacle.height)
+        
+        # Check for collision with the obstacles near the player
+        for obstacle in self.obstacle_hash.query(player.x, player.y, player.width, player.height):
+            if boxes_overlap(player.x, player.y, player.width, player.height,
+                             obstacle.x, obstacle.y, obstacle.width, obstacle.height):
                 self.game_over = True
+                break
         
         # Spawn new obstacles
         self.obstacle_timer += 1
         if self.obstacle_timer >= self.obstacle_spawn_time:
-            self.obstacles.append(Obstacle(self.width, self.height))
+            self.add_obstacle()
             self.obstacle_timer = 0
             
             # Decrease spawn time as game progresses
@@ -2,6 +2,17 @@ import pygame
 import sys
 import random
 import os
+import itertools
+from collections import defaultdict, deque
+
+# Make the shared core package importable when this file is run directly
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from core.game_core import FixedTimestep, make_rng
+from core.replay import ReplayRecorder
+from core.asset_cache import assets
 
 # Game information dictionary
 GAME_INFO = {
@@ -11,20 +22,89 @@ GAME_INFO = {
     "version": "1.0"
 }
 
+# A much bigger, faster board: Game(**LARGE_BOARD), run this file with --large,
+# or set these under gameplay.game_options.snake_reloaded in config/settings.json
+LARGE_BOARD = {"cols": 400, "rows": 300, "cell_size": 2, "tick_rate": 60}
+
+class Board:
+    """Which cells of the grid the snake covers
+    
+    Cells are numbered row by row. The free ones are kept in a list, and
+    each cell's position in that list in another, so occupying or freeing
+    a cell is a swap with the last free cell, checking a cell is a single
+    lookup, and a uniformly random free cell is one randrange away, no
+    matter how full the board is.
+    """
+    
+    def __init__(self, width, height, cell_size):
+        self.cell_size = cell_size
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        self.free = list(range(self.cols * self.rows))
+        self.slot = list(range(self.cols * self.rows))  # Cell -> index in free, -1 if occupied
+    
+    def cell(self, position):
+        """The cell number of a pixel position, or None if it is off the board"""
+        col = position[0] // self.cell_size
+        row = position[1] // self.cell_size
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return None
+    
+    def is_occupied(self, position):
+        cell = self.cell(position)
+        return cell is not None and self.slot[cell] < 0
+    
+    def occupy(self, position):
+        """Mark a position as covered (positions off the board are ignored)"""
+        cell = self.cell(position)
+        if cell is None or self.slot[cell] < 0:
+            return
+        index = self.slot[cell]
+        last = self.free.pop()
+        if last != cell:
+            self.free[index] = last
+            self.slot[last] = index
+        self.slot[cell] = -1
+    
+    def vacate(self, position):
+        """Mark a position as free again"""
+        cell = self.cell(position)
+        if cell is None or self.slot[cell] >= 0:
+            return
+        self.slot[cell] = len(self.free)
+        self.free.append(cell)
+    
+    def random_free(self, rng):
+        """Pixel position of a uniformly random free cell, or None if the board is full"""
+        if not self.free:
+            return None
+        cell = self.free[rng.randrange(len(self.free))]
+        return [(cell % self.cols) * self.cell_size, (cell // self.cols) * self.cell_size]
+
+
 class Snake:
     """Snake player class"""
     
-    def __init__(self, x, y, cell_size):
+    def __init__(self, x, y, cell_size, board):
         self.cell_size = cell_size
         self.direction = "RIGHT"
         self.change_to = self.direction
         
-        # Initial snake body (3 segments)
-        self.body = [
-            [x, y],
-            [x - cell_size, y],
-            [x - (2 * cell_size), y]
-        ]
+        # Initial snake body (3 segments), head first
+        self.body = deque([
+            (x, y),
+            (x - cell_size, y),
+            (x - (2 * cell_size), y)
+        ])
+        self.length = len(self.body)
+        
+        # The board tracks the cells the body covers
+        self.board = board
+        for segment in self.body:
+            board.occupy(segment)
+        self.hit_self = False
+        self.vacated = None  # Tail cell freed by the last move
         
         # Colors
         self.head_color = (0, 255, 0)  # Green
@@ -55,22 +135,28 @@ class Snake:
             self.direction = "RIGHT"
         
         # Move the head
-        head = self.body[0].copy()
+        x, y = self.body[0]
         if self.direction == "UP":
-            head[1] -= self.cell_size
+            y -= self.cell_size
         elif self.direction == "DOWN":
-            head[1] += self.cell_size
+            y += self.cell_size
         elif self.direction == "LEFT":
-            head[0] -= self.cell_size
+            x -= self.cell_size
         elif self.direction == "RIGHT":
-            head[0] += self.cell_size
+            x += self.cell_size
+        head = (x, y)
         
-        # Insert new head
-        self.body.insert(0, head)
+        # Remove tail (unless we're growing) first, so the head may follow it
+        self.vacated = None
+        if len(self.body) >= self.length:
+            self.vacated = self.body.pop()
+            self.board.vacate(self.vacated)
         
-        # Remove tail (unless we're growing)
-        if len(self.body) > self.length:
-            self.body.pop()
+        # Insert new head; landing on the body ends the game, so the board
+        # never needs to count a cell twice
+        self.hit_self = self.board.is_occupied(head)
+        self.body.appendleft(head)
+        self.board.occupy(head)
     
     def grow(self):
         """Increase snake length"""
@@ -84,7 +170,7 @@ class Snake:
                          self.cell_size, self.cell_size))
         
         # Draw body
-        for segment in self.body[1:]:
+        for segment in itertools.islice(self.body, 1, None):
             pygame.draw.rect(screen, self.body_color, 
                             (segment[0], segment[1], 
                              self.cell_size, self.cell_size))
@@ -104,53 +190,49 @@ class Snake:
         )
     
     def check_collision_with_self(self):
-        """Check if snake has collided with itself"""
-        head = self.body[0]
-        return head in self.body[1:]
-    
-    @property
-    def length(self):
-        return len(self.body)
-    
-    @length.setter
-    def length(self, value):
-        # This is used by the grow method
-        pass  # The actual length is determined by the body list
+        """Check if snake has collided with itself (on its last move)"""
+        return self.hit_self
 
 
 class Food:
     """Food class for the snake to eat"""
     
-    def __init__(self, screen_width, screen_height, cell_size):
+    def __init__(self, screen_width, screen_height, cell_size, rng=random, board=None):
         self.cell_size = cell_size
+        self.rng = rng
         self.color = (255, 0, 0)  # Red
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.position = [0, 0]
-        self.respawn(screen_width, screen_height)
+        self.respawn(screen_width, screen_height, board)
     
-    def respawn(self, screen_width=None, screen_height=None, snake_body=None):
-        """Spawn food at a random position, avoiding the snake's body"""
+    def respawn(self, screen_width=None, screen_height=None, board=None):
+        """Spawn food at a random position, on a free cell of the board if given
+        
+        Returns False if the board has no free cell left.
+        """
         if screen_width:
             self.screen_width = screen_width
         if screen_height:
             self.screen_height = screen_height
+        
+        # Pick uniformly among the free cells, however full the board is
+        if board is not None:
+            position = board.random_free(self.rng)
+            if position is None:
+                return False
+            self.position = position
+            return True
             
         # Calculate grid dimensions
         grid_width = self.screen_width // self.cell_size
         grid_height = self.screen_height // self.cell_size
         
         # Generate random position
-        while True:
-            x = random.randint(0, grid_width - 1) * self.cell_size
-            y = random.randint(0, grid_height - 1) * self.cell_size
-            
-            # Check if position overlaps with snake
-            if snake_body and [x, y] in snake_body:
-                continue  # Try again
-            
-            self.position = [x, y]
-            break
+        x = self.rng.randint(0, grid_width - 1) * self.cell_size
+        y = self.rng.randint(0, grid_height - 1) * self.cell_size
+        self.position = [x, y]
+        return True
     
     def draw(self, screen):
         """Draw the food on the screen"""
@@ -162,16 +244,57 @@ class Food:
 class Game:
     """Snake Reloaded game implementation"""
     
-    def __init__(self):
-        self.width = 800
-        self.height = 600
-        self.cell_size = 20
+    # Bump when a change makes the same inputs play out differently, so older replays are rejected
+    SIM_VERSION = 3  # 2: food is placed from the board's free cells, 3: the first food too
+    
+    # Keys that drive the simulation, by action name (see step)
+    ACTIONS = {
+        "up": pygame.K_UP,
+        "down": pygame.K_DOWN,
+        "left": pygame.K_LEFT,
+        "right": pygame.K_RIGHT
+    }
+    
+    def __init__(self, headless=False, seed=None, cols=40, rows=30, cell_size=20, tick_rate=10):
+        # Board settings, recorded with replays so they re-run on the same board
+        self.options = {"cols": cols, "rows": rows, "cell_size": cell_size, "tick_rate": tick_rate}
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.width = cols * cell_size
+        self.height = rows * cell_size
         self.bg_color = (10, 10, 30)
         self.grid_color = (30, 30, 50)
         self.score = 0
         self.game_over = False
         self.paused = False
         
+        # Simulation runs at a fixed tick rate, rendering at 60 FPS
+        self.tick_rate = tick_rate
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.rng, self.seed = make_rng(seed)
+        self.recorder = None  # Inputs of the last interactive session
+        
+        # Initialize game objects
+        self.board = None
+        self.snake = None
+        self.food = None
+        self.clock = None
+        
+        # Rendering keeps the board in an off-screen surface and only redraws
+        # the cells that changed since the last frame (see render)
+        self.background = None
+        self.field = None
+        self.changes = []  # (position, color or None for background) to draw
+        
+        # Headless games skip the window, fonts and sounds entirely
+        self.headless = headless
+        self.sounds = {}
+        if not headless:
+            self.init_display()
+    
+    def init_display(self):
+        """Set up the window, fonts and sounds for interactive play"""
         # Initialize pygame if not already done
         if not pygame.get_init():
             pygame.init()
@@ -180,40 +303,98 @@ class Game:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption(GAME_INFO["title"])
         
+        # Fonts and sounds come from the shared cache, pre-loaded by the hub
+        self.load_assets()
+        
+        # The grid never changes, so it is drawn once
+        self.background = pygame.Surface((self.width, self.height)).convert()
+        self.background.fill(self.bg_color)
+        if self.cell_size >= 6:  # Finer grids would just be a solid color
+            for x in range(0, self.width, self.cell_size):
+                pygame.draw.line(self.background, self.grid_color, (x, 0), (x, self.height))
+            for y in range(0, self.height, self.cell_size):
+                pygame.draw.line(self.background, self.grid_color, (0, y), (self.width, y))
+        self.field = self.background.copy()
+        
+        self.clock = pygame.time.Clock()
+    
+    def load_assets(self):
+        """Load fonts and sounds (cached, so only the first load touches the disk)"""
         # Load fonts
         self.font_dir = os.path.join("assets", "fonts")
-        try:
-            self.font_large = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 36)
-            self.font_medium = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 24)
-            self.font_small = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 18)
-        except FileNotFoundError:
-            self.font_large = pygame.font.SysFont("Arial", 36, bold=True)
-            self.font_medium = pygame.font.SysFont("Arial", 24, bold=True)
-            self.font_small = pygame.font.SysFont("Arial", 18)
+        font_path = os.path.join(self.font_dir, "arcade.ttf")
+        self.font_large = assets.font(font_path, 36, "Arial", bold=True)
+        self.font_medium = assets.font(font_path, 24, "Arial", bold=True)
+        self.font_small = assets.font(font_path, 18, "Arial")
         
         # Load sounds
         self.sound_dir = os.path.join("games", "snake_reloaded", "assets", "sounds")
-        self.sounds = {}
-        try:
-            self.sounds["eat"] = pygame.mixer.Sound(os.path.join(self.sound_dir, "eat.wav"))
-            self.sounds["crash"] = pygame.mixer.Sound(os.path.join(self.sound_dir, "crash.wav"))
-        except:
+        for name in ("eat", "crash"):
+            sound = assets.sound(os.path.join(self.sound_dir, f"{name}.wav"))
+            if sound:
+                self.sounds[name] = sound
+        if not self.sounds:
             print("Could not load sounds")
+    
+    def reset(self, seed=None):
+        """Reset the game to its initial state and return that state
         
-        # Initialize game objects
-        self.snake = None
-        self.food = None
-        self.clock = pygame.time.Clock()
+        Every reset draws a new seed unless one is given, see self.seed.
+        """
+        self.rng, self.seed = make_rng(seed)
         
-    def start(self):
-        """Start the game and return the final score"""
         # Initialize game objects
-        self.snake = Snake(self.width // 2, self.height // 2, self.cell_size)
-        self.food = Food(self.width, self.height, self.cell_size)
+        self.board = Board(self.width, self.height, self.cell_size)
+        self.snake = Snake((self.cols // 2) * self.cell_size, (self.rows // 2) * self.cell_size,
+                           self.cell_size, self.board)
+        self.food = Food(self.width, self.height, self.cell_size, self.rng, self.board)
         self.score = 0
         self.game_over = False
         self.paused = False
         
+        if self.field is not None:
+            self.redraw_field()
+        
+        return self.get_state()
+    
+    def get_state(self):
+        """Snapshot of the simulation state for headless players"""
+        return {
+            "score": self.score,
+            "game_over": self.game_over,
+            "snake": [tuple(segment) for segment in self.snake.body],
+            "direction": self.snake.direction,
+            "food": tuple(self.food.position),
+            "width": self.width,
+            "height": self.height,
+            "cell_size": self.cell_size
+        }
+    
+    def handle_key(self, key):
+        """Handle a gameplay key press"""
+        self.snake.handle_key(key)
+    
+    def step(self, actions=()):
+        """Advance one tick with the given keys pressed, returns (state, reward, done)"""
+        actions = list(actions)
+        previous_score = self.score
+        if not self.game_over:
+            for key in actions:
+                self.handle_key(key)
+            self.update(defaultdict(bool, dict.fromkeys(actions, True)))
+        return self.get_state(), self.score - previous_score, self.game_over
+    
+    def start(self):
+        """Start the game and return the final score"""
+        self.reset()
+        
+        # Record every input the simulation reads so the session can be replayed
+        self.recorder = ReplayRecorder(self.seed, self.tick_rate, self.SIM_VERSION, self.options)
+        
+        # Don't count the time spent before the first frame
+        self.clock.tick()
+        self.timestep.reset()
+        
         # Main game loop
         running = True
         while running:
@@ -229,30 +410,44 @@ class Game:
                     elif event.key == pygame.K_r and self.game_over:
                         return self.start()  # Restart game
                     elif not self.paused and not self.game_over:
-                        self.snake.handle_key(event.key)
+                        self.recorder.key_down(event.key)
+                        self.handle_key(event.key)
+            
+            # Run the simulation in fixed ticks, independent of the frame rate
+            ticks = self.timestep.advance(self.clock.tick(60))
             
             # Update game state if not paused or game over
-            if not self.paused and not self.game_over:
-                self.update()
+            for _ in range(ticks):
+                if self.paused or self.game_over:
+                    break
+                self.update(self.recorder.tick(pygame.key.get_pressed()))
             
             # Render game
             self.render()
-            
-            # Cap the frame rate
-            self.clock.tick(10)
         
         return self.score
     
-    def update(self):
+    def update(self, keys=None):
         """Update game state"""
         # Move snake
+        old_head = self.snake.body[0]
         self.snake.move()
         
+        # Queue the cells to redraw: freed tail, old head (now body), new head
+        if self.field is not None:
+            if self.snake.vacated:
+                self.changes.append((self.snake.vacated, None))
+            self.changes.append((old_head, self.snake.body_color))
+            self.changes.append((self.snake.body[0], self.snake.head_color))
+        
         # Check for collision with food
         if self.snake.check_collision_with_food(self.food):
             self.score += 10
             self.snake.grow()
-            self.food.respawn(self.width, self.height, self.snake.body)
+            if not self.food.respawn(self.width, self.height, self.board):
+                self.game_over = True  # The snake fills the whole board
+            elif self.field is not None:
+                self.changes.append((self.food.position, self.food.color))
             
             # Play sound
             if "eat" in self.sounds:
@@ -266,22 +461,29 @@ class Game:
             if "crash" in self.sounds:
                 self.sounds["crash"].play()
     
+    def redraw_field(self):
+        """Draw the whole board from scratch (after a reset)"""
+        self.changes.clear()
+        self.field.blit(self.background, (0, 0))
+        self.food.draw(self.field)
+        self.snake.draw(self.field)
+    
+    def draw_changes(self):
+        """Bring the cached board up to date by redrawing only the changed cells"""
+        size = self.cell_size
+        for position, color in self.changes:
+            rect = (position[0], position[1], size, size)
+            if color is None:
+                self.field.blit(self.background, rect, rect)
+            else:
+                self.field.fill(color, rect)
+        self.changes.clear()
+    
     def render(self):
         """Render the game"""
-        # Clear screen
-        self.screen.fill(self.bg_color)
-        
-        # Draw grid
-        for x in range(0, self.width, self.cell_size):
-            pygame.draw.line(self.screen, self.grid_color, (x, 0), (x, self.height))
-        for y in range(0, self.height, self.cell_size):
-            pygame.draw.line(self.screen, self.grid_color, (0, y), (self.width, y))
-        
-        # Draw food
-        self.food.draw(self.screen)
-        
-        # Draw snake
-        self.snake.draw(self.screen)
+        # Board: a few cells per tick, whatever the snake's length or board size
+        self.draw_changes()
+        self.screen.blit(self.field, (0, 0))
         
         # Draw score
         score_text = self.font_medium.render(f"Score: {self.score}", True, (0, 255, 0))
@@ -315,7 +517,7 @@ class Game:
 
 # For testing the game directly
 if __name__ == "__main__":
-    game = Game()
+    game = Game(**LARGE_BOARD) if "--large" in sys.argv else Game()
     final_score = game.start()
     print(f"Final score: {final_score}")
     pygame.quit()
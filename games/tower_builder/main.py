@@ -1,7 +1,16 @@
 import pygame
 import sys
-import random
 import os
+from collections import defaultdict
+
+# Make the shared core package importable when this file is run directly
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from core.game_core import FixedTimestep, make_rng
+from core.replay import ReplayRecorder
+from core.asset_cache import assets
 
 # Game information dictionary
 GAME_INFO = {
@@ -61,7 +70,12 @@ class Block:
 class Game:
     """Tower Builder game implementation"""
     
-    def __init__(self):
+    # Keys that drive the simulation, by action name (see step)
+    ACTIONS = {
+        "place": pygame.K_SPACE
+    }
+    
+    def __init__(self, headless=False, seed=None):
         self.width = 800
         self.height = 600
         self.bg_color = (50, 50, 80)  # Dark blue-gray
@@ -81,6 +95,24 @@ class Game:
         # Current moving block
         self.current_block = None
         
+        # Simulation runs at a fixed tick rate
+        self.tick_rate = 60
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.rng, self.seed = make_rng(seed)
+        self.recorder = None  # Inputs of the last interactive session
+        
+        # Headless games skip the window, fonts and sounds entirely
+        self.headless = headless
+        self.sounds = {}
+        self.clock = None
+        if not headless:
+            self.init_display()
+        
+        # Create the first block
+        self.create_first_block()
+    
+    def init_display(self):
+        """Set up the window, fonts and sounds for interactive play"""
         # Initialize pygame if not already done
         if not pygame.get_init():
             pygame.init()
@@ -89,26 +121,11 @@ class Game:
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption(GAME_INFO["title"])
         
-        # Load fonts
-        self.font_dir = os.path.join("assets", "fonts")
-        try:
-            self.font_large = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 36)
-            self.font_medium = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 24)
-            self.font_small = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 18)
-        except FileNotFoundError:
-            self.font_large = pygame.font.SysFont("Arial", 36, bold=True)
-            self.font_medium = pygame.font.SysFont("Arial", 24, bold=True)
-            self.font_small = pygame.font.SysFont("Arial", 18)
-        
-        # Load sounds
-        self.sound_dir = os.path.join("games", "tower_builder", "assets", "sounds")
-        self.sounds = {}
+        # Fonts and sounds come from the shared cache, pre-loaded by the hub
+        self.load_assets()
         
         # Initialize game objects
         self.clock = pygame.time.Clock()
-        
-        # Create the first block
-        self.create_first_block()
     
     def create_first_block(self):
         """Create the first block at the base of the tower"""
@@ -143,9 +160,9 @@ class Game:
     
     def get_random_color(self):
         """Generate a random bright color"""
-        r = random.randint(100, 255)
-        g = random.randint(100, 255)
-        b = random.randint(100, 255)
+        r = self.rng.randint(100, 255)
+        g = self.rng.randint(100, 255)
+        b = self.rng.randint(100, 255)
         return (r, g, b)
     
     def place_block(self):
@@ -179,8 +196,25 @@ class Game:
         
         return True
     
-    def start(self):
-        """Start the game and return the final score"""
+    def load_assets(self):
+        """Load fonts and sounds (cached, so only the first load touches the disk)"""
+        # Load fonts
+        self.font_dir = os.path.join("assets", "fonts")
+        font_path = os.path.join(self.font_dir, "arcade.ttf")
+        self.font_large = assets.font(font_path, 36, "Arial", bold=True)
+        self.font_medium = assets.font(font_path, 24, "Arial", bold=True)
+        self.font_small = assets.font(font_path, 18, "Arial")
+        
+        # Load sounds
+        self.sound_dir = os.path.join("games", "tower_builder", "assets", "sounds")
+    
+    def reset(self, seed=None):
+        """Reset the game to its initial state and return that state
+        
+        Every reset draws a new seed unless one is given, see self.seed.
+        """
+        self.rng, self.seed = make_rng(seed)
+        
         # Reset game state
         self.score = 0
         self.game_over = False
@@ -190,6 +224,46 @@ class Game:
         # Create the first block
         self.create_first_block()
         
+        return self.get_state()
+    
+    def get_state(self):
+        """Snapshot of the simulation state for headless players"""
+        top_block = self.tower_blocks[-1]
+        return {
+            "score": self.score,
+            "game_over": self.game_over,
+            "current_block": (self.current_block.x, self.current_block.width, 
+                              self.current_block.speed * self.current_block.direction),
+            "top_block": (top_block.x, top_block.width),
+            "tower_height": len(self.tower_blocks)
+        }
+    
+    def handle_key(self, key):
+        """Handle a gameplay key press"""
+        if key == pygame.K_SPACE:
+            self.place_block()
+    
+    def step(self, actions=()):
+        """Advance one tick with the given keys pressed, returns (state, reward, done)"""
+        actions = list(actions)
+        previous_score = self.score
+        if not self.game_over:
+            for key in actions:
+                self.handle_key(key)
+            self.update(defaultdict(bool, dict.fromkeys(actions, True)))
+        return self.get_state(), self.score - previous_score, self.game_over
+    
+    def start(self):
+        """Start the game and return the final score"""
+        self.reset()
+        
+        # Record every input the simulation reads so the session can be replayed
+        self.recorder = ReplayRecorder(self.seed, self.tick_rate)
+        
+        # Don't count the time spent before the first frame
+        self.clock.tick()
+        self.timestep.reset()
+        
         # Main game loop
         running = True
         while running:
@@ -202,24 +276,27 @@ class Game:
                         return self.score
                     elif event.key == pygame.K_p:
                         self.paused = not self.paused
-                    elif event.key == pygame.K_SPACE and not self.paused and not self.game_over:
-                        self.place_block()
                     elif event.key == pygame.K_r and self.game_over:
                         return self.start()  # Restart game
+                    elif not self.paused and not self.game_over:
+                        self.recorder.key_down(event.key)
+                        self.handle_key(event.key)
+            
+            # Run the simulation in fixed ticks, independent of the frame rate
+            ticks = self.timestep.advance(self.clock.tick(60))
             
             # Update game state if not paused or game over
-            if not self.paused and not self.game_over:
-                self.update()
+            for _ in range(ticks):
+                if self.paused or self.game_over:
+                    break
+                self.update(self.recorder.tick(pygame.key.get_pressed()))
             
             # Render game
             self.render()
-            
-            # Cap the frame rate
-            self.clock.tick(60)
         
         return self.score
     
-    def update(self):
+    def update(self, keys=None):
         """Update game state"""
         # Move current block
         if self.current_block:
@@ -2,6 +2,17 @@ import pygame
 import sys
 import random
 import os
+from collections import defaultdict
+
+# Make the shared core package importable when this file is run directly
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from core.game_core import FixedTimestep, make_rng
+from core.replay import ReplayRecorder
+from core.asset_cache import assets
+from core.spatial_hash import SpatialHash, boxes_overlap
 
 # Game information dictionary
 GAME_INFO = {
@@ -66,13 +77,13 @@ class Player:
 class Enemy:
     """Enemy UFO"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=random):
         self.width = 40
         self.height = 20
         self.color = (255, 0, 0)  # Red
         self.x = x
         self.y = y
-        self.speed = random.randint(1, 3)
+        self.speed = rng.randint(1, 3)
         self.direction = 1  # 1 for right, -1 for left
     
     def move(self, screen_width):
@@ -132,7 +143,14 @@ class Bullet:
 class Game:
     """UFO Invasion game implementation"""
     
-    def __init__(self):
+    # Keys that drive the simulation, by action name (see step)
+    ACTIONS = {
+        "left": pygame.K_LEFT,
+        "right": pygame.K_RIGHT,
+        "fire": pygame.K_SPACE
+    }
+    
+    def __init__(self, headless=False, seed=None):
         self.width = 800
         self.height = 600
         self.bg_color = (0, 0, 40)  # Dark blue
@@ -142,41 +160,47 @@ class Game:
         self.game_over = False
         self.paused = False
         
-        # Initialize pygame if not already done
-        if not pygame.get_init():
-            pygame.init()
-            
-        # Set up display
-        self.screen = pygame.display.set_mode((self.width, self.height))
-        pygame.display.set_caption(GAME_INFO["title"])
-        
-        # Load fonts
-        self.font_dir = os.path.join("assets", "fonts")
-        try:
-            self.font_large = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 36)
-            self.font_medium = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 24)
-            self.font_small = pygame.font.Font(os.path.join(self.font_dir, "arcade.ttf"), 18)
-        except FileNotFoundError:
-            self.font_large = pygame.font.SysFont("Arial", 36, bold=True)
-            self.font_medium = pygame.font.SysFont("Arial", 24, bold=True)
-            self.font_small = pygame.font.SysFont("Arial", 18)
+        # Simulation runs at a fixed tick rate
+        self.tick_rate = 60
+        self.timestep = FixedTimestep(self.tick_rate)
+        self.rng, self.seed = make_rng(seed)
+        self.recorder = None  # Inputs of the last interactive session
         
-        # Load sounds
-        self.sound_dir = os.path.join("games", "ufo_invasion", "assets", "sounds")
+        # Headless games skip the window, fonts and sounds entirely
+        self.headless = headless
         self.sounds = {}
+        self.clock = None
+        if not headless:
+            self.init_display()
         
         # Initialize game objects
         self.player = Player(self.width, self.height)
         self.enemies = []
+        self.enemy_hash = SpatialHash(cell_size=64)  # Broad phase for bullet-enemy collisions
         self.bullets = []
-        self.clock = pygame.time.Clock()
         
         # Create enemies for the first level
         self.create_enemies(self.level)
     
+    def init_display(self):
+        """Set up the window, fonts and sounds for interactive play"""
+        # Initialize pygame if not already done
+        if not pygame.get_init():
+            pygame.init()
+            
+        # Set up display
+        self.screen = pygame.display.set_mode((self.width, self.height))
+        pygame.display.set_caption(GAME_INFO["title"])
+        
+        # Fonts and sounds come from the shared cache, pre-loaded by the hub
+        self.load_assets()
+        
+        self.clock = pygame.time.Clock()
+    
     def create_enemies(self, level):
         """Create enemies for the current level"""
         self.enemies = []
+        self.enemy_hash.clear()
         
         # Number of rows and columns based on level
         rows = min(2 + level // 2, 5)
@@ -194,10 +218,29 @@ class Game:
                 x = col * (enemy_width + x_margin) + x_margin
                 y = row * (enemy_height + y_margin) + y_margin + 50
                 
-                self.enemies.append(Enemy(x, y))
+                enemy = Enemy(x, y, self.rng)
+                self.enemies.append(enemy)
+                self.enemy_hash.insert(enemy, x, y, enemy.width, enemy.height)
     
-    def start(self):
-        """Start the game and return the final score"""
+    def load_assets(self):
+        """Load fonts and sounds (cached, so only the first load touches the disk)"""
+        # Load fonts
+        self.font_dir = os.path.join("assets", "fonts")
+        font_path = os.path.join(self.font_dir, "arcade.ttf")
+        self.font_large = assets.font(font_path, 36, "Arial", bold=True)
+        self.font_medium = assets.font(font_path, 24, "Arial", bold=True)
+        self.font_small = assets.font(font_path, 18, "Arial")
+        
+        # Load sounds
+        self.sound_dir = os.path.join("games", "ufo_invasion", "assets", "sounds")
+    
+    def reset(self, seed=None):
+        """Reset the game to its initial state and return that state
+        
+        Every reset draws a new seed unless one is given, see self.seed.
+        """
+        self.rng, self.seed = make_rng(seed)
+        
         # Reset game state
         self.score = 0
         self.level = 1
@@ -212,6 +255,49 @@ class Game:
         self.player = Player(self.width, self.height)
         self.bullets = []
         
+        return self.get_state()
+    
+    def get_state(self):
+        """Snapshot of the simulation state for headless players"""
+        return {
+            "score": self.score,
+            "lives": self.lives,
+            "level": self.level,
+            "game_over": self.game_over,
+            "player": (self.player.x, self.player.y, self.player.width),
+            "can_shoot": self.player.can_shoot(),
+            "enemies": [(enemy.x, enemy.y, enemy.width, enemy.height) for enemy in self.enemies],
+            "bullets": [(bullet.x, bullet.y) for bullet in self.bullets]
+        }
+    
+    def handle_key(self, key):
+        """Handle a gameplay key press"""
+        if key == pygame.K_SPACE:
+            bullet = self.player.shoot()
+            if bullet:
+                self.bullets.append(bullet)
+    
+    def step(self, actions=()):
+        """Advance one tick with the given keys pressed, returns (state, reward, done)"""
+        actions = list(actions)
+        previous_score = self.score
+        if not self.game_over:
+            for key in actions:
+                self.handle_key(key)
+            self.update(defaultdict(bool, dict.fromkeys(actions, True)))
+        return self.get_state(), self.score - previous_score, self.game_over
+    
+    def start(self):
+        """Start the game and return the final score"""
+        self.reset()
+        
+        # Record every input the simulation reads so the session can be replayed
+        self.recorder = ReplayRecorder(self.seed, self.tick_rate)
+        
+        # Don't count the time spent before the first frame
+        self.clock.tick()
+        self.timestep.reset()
+        
         # Main game loop
         running = True
         while running:
@@ -224,29 +310,31 @@ class Game:
                         return self.score
                     elif event.key == pygame.K_p:
                         self.paused = not self.paused
-                    elif event.key == pygame.K_SPACE and not self.paused and not self.game_over:
-                        bullet = self.player.shoot()
-                        if bullet:
-                            self.bullets.append(bullet)
                     elif event.key == pygame.K_r and self.game_over:
                         return self.start()  # Restart game
+                    elif not self.paused and not self.game_over:
+                        self.recorder.key_down(event.key)
+                        self.handle_key(event.key)
+            
+            # Run the simulation in fixed ticks, independent of the frame rate
+            ticks = self.timestep.advance(self.clock.tick(60))
             
             # Update game state if not paused or game over
-            if not self.paused and not self.game_over:
-                self.update()
+            for _ in range(ticks):
+                if self.paused or self.game_over:
+                    break
+                self.update(self.recorder.tick(pygame.key.get_pressed()))
             
             # Render game
             self.render()
-            
-            # Cap the frame rate
-            self.clock.tick(60)
         
         return self.score
     
-    def update(self):
+    def update(self, keys=None):
         """Update game state"""
         # Get keyboard state
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Move player
         if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -260,11 +348,13 @@ class Game:
         # Move enemies
         for enemy in self.enemies:
             enemy.move(self.width)
+            self.enemy_hash.move(enemy, enemy.x, enemy.y, enemy.width, enemy.height)
             
             # Check if enemy reached bottom
             if enemy.y + enemy.height >= self.player.y:
                 self.lives -= 1
                 self.enemies.remove(enemy)
+                self.enemy_hash.remove(enemy)
                 if self.lives <= 0:
                     self.game_over = True
         
@@ -277,11 +367,12 @@ class Game:
                 self.bullets.remove(bullet)
                 continue
             
-            # Check for collision with enemies
-            bullet_rect = bullet.get_rect()
-            for enemy in self.enemies[:]:
-                if bullet_rect.colliderect(enemy.get_rect()):
+            # Check for collision with the enemies near the bullet
+            for enemy in self.enemy_hash.query(bullet.x, bullet.y, bullet.width, bullet.height):
+                if boxes_overlap(bullet.x, bullet.y, bullet.width, bullet.height,
+                                 enemy.x, enemy.y, enemy.width, enemy.height):
                     self.enemies.remove(enemy)
+                    self.enemy_hash.remove(enemy)
                     self.bullets.remove(bullet)
                     self.score += 10
                     break
@@ -2,10 +2,18 @@ import pygame
 import sys
 import os
 import json
+import time
+import threading
 from core.gui_manager import GUIManager
 from core.game_loader import GameLoader
 from core.user_profile import UserProfile
 from core.leaderboard import Leaderboard
+from core.frame_scheduler import FrameScheduler
+from core.replay import Replay, ReplayPlayer, UnsupportedReplay, replay_options
+from core.persistence import PersistenceWorker
+from core.prewarm import Prewarmer
+from core.hot_reload import GameWatcher
+from core.process_runner import ProcessRunner
 
 class ArcadeHub:
     """Main arcade hub application"""
@@ -24,19 +32,45 @@ class ArcadeHub:
         pygame.display.set_caption("ByteBlitz Arcade")
         
         # Initialize components
+        self.persistence = PersistenceWorker()  # Saves files off the render thread
         self.gui = GUIManager(self.screen, self.settings)
-        self.user_profile = UserProfile(self.settings)
+        self.user_profile = UserProfile(self.settings, self.persistence)
         self.leaderboard = Leaderboard(self.gui, self.user_profile)
         self.game_loader = GameLoader()
+        self.replay_player = ReplayPlayer()  # Only used on the persistence worker
+        self.verified_scores = []  # (game_id, score) whose replays checked out
+        self.verified_lock = threading.Lock()
         
         # Load games
         self.games = self.game_loader.discover_games() or {}
         
+        # Import games and load their assets in the background while the menu is up
+        self.prewarmer = Prewarmer(self.game_loader)
+        self.prewarmer.start()
+        self.prewarm_reported = False
+        
+        # Optionally play games in separate worker processes
+        self.runner = None
+        runner_settings = self.settings.get("runner", {})
+        if runner_settings.get("isolated", False):
+            self.runner = ProcessRunner(self.game_loader.games_path,
+                                        pool_size=runner_settings.get("pool_size", 1),
+                                        cpu_seconds=runner_settings.get("cpu_seconds"),
+                                        memory_mb=runner_settings.get("memory_mb"))
+        
+        # Re-import individual games when their sources change
+        self.watcher = None
+        if self.settings["gameplay"].get("hot_reload", True):
+            self.watcher = GameWatcher(self.game_loader)
+        
         # State variables
         self.current_screen = "main_menu"
         self.selected_game = None
         self.running = True
         self.clock = pygame.time.Clock()
+        self.scheduler = FrameScheduler(self.clock, 
+                                        idle_fps=self.settings["display"].get("idle_fps", 10))
+        self.frame_time = 1000 / 60
         
         # Input handling
         self.editing_name = False
@@ -45,6 +79,11 @@ class ArcadeHub:
         # Debug flag
         self.debug = True  # Start with debug on to see any issues
         
+        # Dirty-rect rendering only pushes changed regions to the display
+        self.gui.dirty_tracking = self.settings["display"].get("dirty_rects", False)
+        self.full_redraw = True
+        self.dirty_area = 0
+        
     def load_settings(self):
         """Load settings from config file"""
         config_path = os.path.join("config", "settings.json")
@@ -81,7 +120,12 @@ class ArcadeHub:
             }
     
     def save_settings(self):
-        """Save settings to config file"""
+        """Save settings to config file (in the background)"""
+        # Serialize now so later edits don't leak into this save
+        self.persistence.submit("settings", self.write_settings, json.dumps(self.settings, indent=2))
+    
+    def write_settings(self, data):
+        """Write serialized settings to the config file"""
         config_path = os.path.join("config", "settings.json")
         try:
             # Ensure the config directory exists
@@ -90,7 +134,7 @@ class ArcadeHub:
             # Create a temporary file first, then rename to avoid corruption
             temp_path = config_path + ".tmp"
             with open(temp_path, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+                f.write(data)
                 f.flush()
                 os.fsync(f.fileno())  # Ensure data is written to disk
                 
@@ -105,14 +149,31 @@ class ArcadeHub:
             self.handle_events()
             self.update()
             self.render()
-            self.clock.tick(60)
+            self.frame_time = self.scheduler.tick(busy=self.gui.is_animating())
             
+        # Make sure every score and setting is on disk before exiting
+        self.prewarmer.shutdown()
+        if self.watcher:
+            self.watcher.stop()
+        if self.runner:
+            self.runner.close()
+        self.persistence.close()
+        self.record_verified_scores()  # Verified while closing
+        self.user_profile.close()
         pygame.quit()
         sys.exit()
     
     def handle_events(self):
         """Handle pygame events"""
         for event in pygame.event.get():
+            # Any input brings the hub back to full frame rate
+            self.scheduler.wake()
+            
+            # Hover changes are tracked per widget, anything else may
+            # change state that is drawn outside the GUI manager
+            if event.type != pygame.MOUSEMOTION:
+                self.full_redraw = True
+            
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.VIDEORESIZE:
@@ -127,6 +188,8 @@ class ArcadeHub:
                 
                 self.width, self.height = width, height
                 self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE)
+                self.gui.set_screen(self.screen)
+                self.leaderboard.screen = self.screen
                 self.settings["display"]["width"] = self.width
                 self.settings["display"]["height"] = self.height
             elif event.type == pygame.KEYDOWN:
@@ -143,6 +206,8 @@ class ArcadeHub:
                     # Reload games
                     print("Reloading games...")
                     self.games = self.game_loader.discover_games() or {}
+                    self.persistence.submit(("forget", None), self.replay_player.forget, None)
+                    self.prewarmer.start()
                 
                 # Handle name editing with input sanitization
                 if self.editing_name:
@@ -190,7 +255,35 @@ class ArcadeHub:
     
     def update(self):
         """Update game state"""
-        self.gui.update()  # Update GUI animations
+        self.gui.update(self.frame_time * 60 / 1000)  # Update GUI animations
+        
+        # Report warm-up timings once every game is ready
+        if self.debug and not self.prewarm_reported and self.prewarmer.done:
+            print(f"Pre-warmed {self.prewarmer.ready} games in {self.prewarmer.elapsed * 1000:.0f} ms")
+            for line in self.prewarmer.report():
+                print(f"  {line}")
+            self.prewarm_reported = True
+        
+        self.record_verified_scores()
+        
+        # Hot reload games whose sources changed
+        if self.watcher:
+            for game_id in sorted(self.watcher.take_changes()):
+                self.reload_game(game_id)
+    
+    def reload_game(self, game_id):
+        """Re-import one game after its sources changed, leaving the others alone"""
+        start = time.perf_counter()
+        game_info = self.game_loader.reload_game(game_id)
+        
+        # Nothing may keep running the old code (the replay player lives on the worker)
+        self.persistence.submit(("forget", game_id), self.replay_player.forget, game_id)
+        self.prewarmer.forget(game_id)
+        if game_info:
+            self.prewarmer.start([game_id])  # Reload its assets too
+        
+        if self.debug and game_info:
+            print(f"Reloaded '{game_id}' in {(time.perf_counter() - start) * 1000:.1f} ms")
     
     def render(self):
         """Render the current screen"""
@@ -214,8 +307,10 @@ class ArcadeHub:
         if self.debug:
             self.gui.draw_text(f"Current Screen: {self.current_screen}", "small", "neon_green", 
                               10, 10, align="left")
-            self.gui.draw_text(f"FPS: {int(self.clock.get_fps())}", "small", "neon_green", 
-                              10, 30, align="left")
+            self.gui.draw_text(f"FPS: {int(self.scheduler.get_fps())} ({self.scheduler.mode}) | "
+                              f"Active: {self.scheduler.mode_time['active']:.0f}s "
+                              f"Idle: {self.scheduler.mode_time['idle']:.0f}s", 
+                              "small", "neon_green", 10, 30, align="left")
             self.gui.draw_text(f"Games Loaded: {len(self.games)}", "small", "neon_green", 
                               10, 50, align="left")
             if self.games:
@@ -225,12 +320,55 @@ class ArcadeHub:
                 self.gui.draw_text(f"Game IDs: {game_ids}", "small", "neon_green", 
                                   10, 70, align="left")
             
+            # Text cache stats
+            text_cache = self.gui.text_cache
+            self.gui.draw_text(f"Text Cache: {text_cache.hits} hits / {text_cache.misses} misses "
+                              f"({len(text_cache)} entries, {text_cache.total_bytes // 1024} KB)", 
+                              "small", "neon_green", 10, 90, align="left")
+            
+            # Leaderboard reads served from memory vs. queried from the score store
+            top_scores = self.user_profile.top_scores
+            self.gui.draw_text(f"Top Scores: {top_scores.hits} hits / {top_scores.misses} store reads "
+                              f"({top_scores.updates} updates)", 
+                              "small", "neon_green", 10, 110, align="left")
+            
+            # Background game warm-up
+            prewarm_text = f"Pre-warm: {self.prewarmer.ready}/{len(self.prewarmer.futures)} games ready"
+            if self.prewarmer.elapsed is not None:
+                prewarm_text += f" in {self.prewarmer.elapsed * 1000:.0f} ms"
+            self.gui.draw_text(prewarm_text, "small", "neon_green", 10, 150, align="left")
+            
+            # Background write queue
+            persistence = self.persistence
+            self.gui.draw_text(f"Saves: {persistence.depth} queued | {persistence.written} written "
+                              f"({persistence.coalesced} coalesced) | "
+                              f"last {persistence.last_latency * 1000:.1f} ms, "
+                              f"max {persistence.max_latency * 1000:.1f} ms", 
+                              "small", "neon_green", 10, 130, align="left")
+            
+            # Dirty-rect stats
+            if self.gui.dirty_tracking:
+                dirty_percent = 100 * self.dirty_area // max(1, self.width * self.height)
+                self.gui.draw_text(f"Dirty Area: {dirty_percent}% of screen", "small", "neon_green", 
+                                  10, 170, align="left")
+            
             # Help text
             self.gui.draw_text("F1: Toggle Debug | F5: Reload Games", "small", "neon_yellow", 
                               self.width - 10, 10, align="right")
         
         # Update display
-        pygame.display.flip()
+        if self.gui.dirty_tracking:
+            dirty_rects = self.gui.collect_dirty_rects()
+            if self.full_redraw:
+                pygame.display.flip()
+                self.full_redraw = False
+                self.dirty_area = self.width * self.height
+            else:
+                if dirty_rects:
+                    pygame.display.update(dirty_rects)
+                self.dirty_area = sum(rect.width * rect.height for rect in dirty_rects)
+        else:
+            pygame.display.flip()
     
     def render_main_menu(self):
         """Render the main menu screen"""
@@ -263,6 +401,8 @@ class ArcadeHub:
         # Leaderboard button
         if self.gui.draw_button("LEADERBOARD", "heading", button_x, start_y + button_spacing, 
                                button_width, button_height, self.gui.colors["neon_blue"])[0]:
+            # Pick up scores recorded elsewhere (e.g. a tournament) since the last visit
+            self.user_profile.reload()
             self.current_screen = "leaderboard"
         
         # Settings button
@@ -577,17 +717,31 @@ class ArcadeHub:
         """Launch a selected game"""
         if self.debug:
             print(f"Launching game: {game_id}")
+        
+        # Bad settings are caught now rather than when the score is recorded
+        options = self.game_options(game_id)
+        if options is None:
+            return
+        
+        if self.runner:
+            self.launch_isolated_game(game_id, options)
+            return
             
-        game = self.game_loader.launch_game(game_id)
+        start = time.perf_counter()
+        game = self.game_loader.launch_game(game_id, **options)
+        if self.debug:
+            print(f"Game ready in {(time.perf_counter() - start) * 1000:.1f} ms")
         
         if game:
             # Run the game
             try:
                 score = game.start()
                 
-                # Update score if game returned a score
+                # Update score once its replay agrees with it
                 if isinstance(score, (int, float)) and score > 0:
-                    self.leaderboard.update_score(game_id, score)
+                    recorder = getattr(game, "recorder", None)
+                    replay = recorder.to_bytes(game_id, score) if recorder else None
+                    self.record_score(game_id, replay, score)
                     
             except Exception as e:
                 print(f"Error launching game '{game_id}': {e}")
@@ -596,6 +750,90 @@ class ArcadeHub:
             self.current_screen = "game_select"
         else:
             print(f"Failed to launch game: {game_id}")
+    
+    def game_options(self, game_id):
+        """Constructor arguments for a game from settings (gameplay.game_options), None if invalid
+        
+        Options are recorded in replays, so they must be non-negative whole numbers.
+        """
+        options = self.settings["gameplay"].get("game_options", {}).get(game_id, {})
+        try:
+            return replay_options(options)
+        except ValueError as e:
+            print(f"Can't launch '{game_id}', fix gameplay.game_options in config/settings.json: {e}")
+            return None
+    
+    def launch_isolated_game(self, game_id, options=None):
+        """Play a game in a worker process, keeping the hub responsive meanwhile"""
+        result = self.runner.run(game_id, wait=self.wait_for_game, options=options)
+        telemetry = result["telemetry"]
+        
+        if result.get("error"):
+            print(f"Game '{game_id}' failed: {result['error']}")
+        elif self.debug:
+            print(f"Game '{game_id}' ran {telemetry['ticks']} ticks in {telemetry['play_time']:.1f} s, "
+                  f"{telemetry['cpu_time']:.1f} s CPU, {telemetry['dropped_ticks']} dropped ticks, "
+                  f"peak {telemetry['max_rss_mb'] or 0:.0f} MB")
+        
+        score = result["score"]
+        if isinstance(score, (int, float)) and score > 0:
+            self.record_score(game_id, result["replay"], score)
+        
+        self.current_screen = "game_select"
+    
+    def wait_for_game(self):
+        """Called while a worker plays a game: keep the hub window alive, ignoring input"""
+        pygame.event.clear()
+    
+    def record_score(self, game_id, replay, score):
+        """Record a score, once the session's replay agrees with it"""
+        if replay is None:
+            self.leaderboard.update_score(game_id, score)  # Game doesn't support replays
+            return
+        
+        # Re-simulating a long session takes a while, so it runs on the persistence
+        # worker; the bytes object stays alive while queued, so its id is a unique key
+        self.persistence.submit(("replay", id(replay)), self.check_replay, (game_id, replay, score))
+    
+    def check_replay(self, job):
+        """Save a session's replay and check its score against it (on the persistence worker)"""
+        game_id, data, score = job
+        try:
+            replay = Replay(data)
+        except ValueError as e:
+            print(f"Score {score} for '{game_id}' has an unreadable replay, not recorded: {e}")
+            return
+        
+        # The seed tells apart sessions that ended within the same second
+        replay_path = os.path.join("config", "replays",
+                                   f"{game_id}_{time.strftime('%Y%m%d_%H%M%S')}_{replay.seed}.bbr")
+        try:
+            os.makedirs(os.path.dirname(replay_path), exist_ok=True)
+            with open(replay_path, 'wb') as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Error saving replay: {e}")
+        
+        if self.settings["gameplay"].get("verify_scores", True):
+            try:
+                ok, replayed = self.replay_player.verify(replay)
+            except UnsupportedReplay as e:
+                # The game was reloaded with a new simulation while it was being played
+                print(f"Score {score} for '{game_id}' can't be verified, not recorded: {e}")
+                return
+            if not ok:
+                print(f"Score {score} for '{game_id}' does not match its replay ({replayed}), not recorded")
+                return
+        
+        with self.verified_lock:
+            self.verified_scores.append((game_id, score))
+    
+    def record_verified_scores(self):
+        """Add the scores verified on the persistence worker to the leaderboard"""
+        with self.verified_lock:
+            verified, self.verified_scores = self.verified_scores, []
+        for game_id, score in verified:
+            self.leaderboard.update_score(game_id, score)
 
 if __name__ == "__main__":
     arcade = ArcadeHub()